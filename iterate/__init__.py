@@ -2,9 +2,15 @@
 Iterate - Intelligent file discovery and analysis tool.
 """
 
+import sys
+
 __version__ = "0.1.0"
 __author__ = "Iterate Team"
 
+# Dataclasses across the package use slots=True, added in Python 3.10
+if sys.version_info < (3, 10):
+    raise ImportError("Iterate requires Python 3.10 or newer")
+
 # Core components
 from .core.file_finder import FileFinder
 from .core.cache_manager import CacheManager
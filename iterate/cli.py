@@ -233,7 +233,7 @@ Examples:
             from .integrations.mcp_repository_analyzer import MCPRepositoryAnalyzer
             
             error_handler = ErrorHandler()
-            analyzer = MCPRepositoryAnalyzer(error_handler=error_handler)
+            analyzer = MCPRepositoryAnalyzer(error_handler=error_handler, use_cache=use_cache)
             
             analysis = analyzer.analyze_repository(args.directory)
             analyzer.print_analysis_summary(analysis)
@@ -9,6 +9,8 @@ from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 
+from .cache_manager import FileResultCache
+
 
 @dataclass
 class ComplexityMetrics:
@@ -33,12 +35,16 @@ class QualityMetrics:
 class AdvancedCodeAnalyzer:
     """Advanced code quality analyzer."""
     
-    def __init__(self):
+    def __init__(self, complexity_cache: Optional[FileResultCache] = None,
+                 function_cache: Optional[FileResultCache] = None):
         self.complexity_thresholds = {
             'low': 5,
             'medium': 10,
             'high': 15
         }
+        # Optional per-file caches so unchanged files aren't re-read on reruns
+        self.complexity_cache = complexity_cache
+        self.function_cache = function_cache
     
     def analyze_file_complexity(self, file_path: str) -> Optional[ComplexityMetrics]:
         """Analyze code complexity for a single file."""
@@ -62,12 +68,8 @@ class AdvancedCodeAnalyzer:
         try:
             tree = ast.parse(content)
             
-            # Count lines of code
-            lines = content.split('\n')
-            loc = len([line for line in lines if line.strip() and not line.strip().startswith('#')])
-            
-            # Count comments
-            comments = len([line for line in lines if line.strip().startswith('#')])
+            # Count lines of code and comments
+            loc, comments = self._count_lines(content, '#')
             comment_ratio = comments / max(loc, 1)
             
             # Cyclomatic complexity (simplified)
@@ -106,13 +108,22 @@ class AdvancedCodeAnalyzer:
         except SyntaxError:
             return ComplexityMetrics(1, 1, 100, 1, 0.0)
     
+    @staticmethod
+    def _count_lines(content: str, comment_prefix: str) -> Tuple[int, int]:
+        """Count (code lines, comment lines) in one pass; blank lines count as neither."""
+        loc = 0
+        comments = 0
+        for line in content.split('\n'):
+            stripped = line.strip()
+            if stripped.startswith(comment_prefix):
+                comments += 1
+            elif stripped:
+                loc += 1
+        return loc, comments
+    
     def _analyze_js_complexity(self, content: str) -> ComplexityMetrics:
         """Analyze JavaScript/TypeScript code complexity using regex."""
-        lines = content.split('\n')
-        loc = len([line for line in lines if line.strip() and not line.strip().startswith('//')])
-        
-        # Count comments
-        comments = len([line for line in lines if line.strip().startswith('//')])
+        loc, comments = self._count_lines(content, '//')
         comment_ratio = comments / max(loc, 1)
         
         # Cyclomatic complexity (simplified)
@@ -142,22 +153,15 @@ class AdvancedCodeAnalyzer:
         
         # Simple token-based duplication detection
         file_tokens = {}
+        function_cache = self.function_cache
         for file_path in files:
             if file_path.endswith(('.py', '.js', '.jsx', '.ts', '.tsx')):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    # Extract function definitions
-                    if file_path.endswith('.py'):
-                        functions = self._extract_python_functions(content)
-                    else:
-                        functions = self._extract_js_functions(content)
-                    
+                if function_cache is not None:
+                    functions = function_cache.get_or_compute(file_path, self._extract_file_functions)
+                else:
+                    functions = self._extract_file_functions(file_path)
+                if functions is not None:
                     file_tokens[file_path] = functions
-                    
-                except Exception as e:
-                    print(f"⚠️  Error reading {file_path}: {e}")
         
         # Find duplicates
         for file1, functions1 in file_tokens.items():
@@ -177,6 +181,21 @@ class AdvancedCodeAnalyzer:
         
         return duplicates
     
+    def _extract_file_functions(self, file_path: str) -> Optional[Dict[str, str]]:
+        """Read a file and extract its function definitions, or None if it can't be read."""
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            
+            # Extract function definitions
+            if file_path.endswith('.py'):
+                return self._extract_python_functions(content)
+            return self._extract_js_functions(content)
+            
+        except Exception as e:
+            print(f"⚠️  Error reading {file_path}: {e}")
+            return None
+    
     def _extract_python_functions(self, content: str) -> Dict[str, str]:
         """Extract Python function definitions."""
         functions = {}
@@ -250,10 +269,14 @@ class AdvancedCodeAnalyzer:
         
         total_complexity = 0
         high_complexity_files = []
+        complexity_cache = self.complexity_cache
         
         for file_path in files:
             if file_path.endswith(('.py', '.js', '.jsx', '.ts', '.tsx')):
-                complexity = self.analyze_file_complexity(file_path)
+                if complexity_cache is not None:
+                    complexity = complexity_cache.get_or_compute(file_path, self.analyze_file_complexity)
+                else:
+                    complexity = self.analyze_file_complexity(file_path)
                 if complexity:
                     report['files_analyzed'] += 1
                     report['complexity_metrics'][file_path] = complexity
@@ -268,6 +291,10 @@ class AdvancedCodeAnalyzer:
         # Detect duplication
         report['duplication_findings'] = self.detect_code_duplication(files)
         
+        for cache in (complexity_cache, self.function_cache):
+            if cache is not None:
+                cache.save()
+        
         # Calculate quality scores
         avg_complexity = total_complexity / max(report['files_analyzed'], 1)
         avg_metrics = ComplexityMetrics(
@@ -5,9 +5,17 @@ Provides actual AI-generated code improvements.
 
 import openai
 import os
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 
+# Delimits per-function records in batched prompts and responses
+BATCH_SEPARATOR = "\n---RECORD|||SEP|||BOUNDARY---\n"
+
+# Output tokens allowed per refactored function, as in the single-function
+# prompt, and for a whole batched response
+REFACTORING_TOKENS = 2000
+MAX_BATCH_TOKENS = 4000
+
 
 @dataclass
 class AICodeSuggestion:
@@ -93,30 +101,149 @@ class AICodeGenerator:
             # Debug: Print the AI response for troubleshooting
             print(f"🔍 AI Response Preview: {ai_response[:200]}...")
             
-            # Parse the AI response
-            refactored_code = self._extract_code_block(ai_response, "REFACTORED_CODE")
-            explanation = self._extract_section(ai_response, "EXPLANATION")
-            helper_functions = self._extract_code_block(ai_response, "HELPER_FUNCTIONS")
-            best_practices = self._extract_section(ai_response, "BEST_PRACTICES")
+            return self._parse_refactoring_response(file_path, function_code, ai_response)
             
-            # If no code was extracted, try to extract any code block
-            if not refactored_code:
-                refactored_code = self._extract_any_code_block(ai_response)
+        except Exception as e:
+            print(f"❌ Error generating AI refactoring: {e}")
+            return None
+    
+    def generate_refactoring_suggestions_batch(self, file_chunks: List[Tuple[str, str, Dict[str, Any]]],
+                                               batch_size: int = MAX_BATCH_TOKENS // REFACTORING_TOKENS) -> List[Optional[AICodeSuggestion]]:
+        """
+        Generate refactoring suggestions for several functions, one API call per batch.
+        
+        Args:
+            file_chunks: (file_path, function_code, complexity_metrics) tuples
+            batch_size: Maximum number of functions sent in a single prompt; capped
+                so each function keeps REFACTORING_TOKENS of the response budget
             
-            return AICodeSuggestion(
-                file_path=file_path,
-                function_name=self._extract_function_name(function_code),
-                suggestion_type="ai_refactoring",
-                description=f"AI-generated refactoring for complex function",
-                original_code=function_code,
-                ai_generated_code=refactored_code,
-                confidence=0.9,
-                reasoning=explanation
+        Returns:
+            Suggestions aligned with file_chunks (None where generation failed)
+        """
+        if not self.api_key:
+            return [None] * len(file_chunks)
+        
+        batch_size = max(1, min(batch_size, MAX_BATCH_TOKENS // REFACTORING_TOKENS))
+        suggestions = []
+        for start in range(0, len(file_chunks), batch_size):
+            suggestions.extend(self._generate_refactoring_batch(file_chunks[start:start + batch_size]))
+        return suggestions
+    
+    def _generate_refactoring_batch(self, batch: List[Tuple[str, str, Dict[str, Any]]]) -> List[Optional[AICodeSuggestion]]:
+        """Send one prompt for a batch of functions and split the answer per function."""
+        if len(batch) == 1:
+            return [self.generate_refactoring_suggestion(*batch[0])]
+        
+        records = []
+        for index, (file_path, function_code, complexity_metrics) in enumerate(batch, 1):
+            records.append(f"""FUNCTION {index}:
+        {function_code}
+
+        Complexity metrics:
+        - Cyclomatic complexity: {complexity_metrics.get('cyclomatic_complexity', 'unknown')}
+        - Lines of code: {complexity_metrics.get('lines_of_code', 'unknown')}
+        - Parameter count: {complexity_metrics.get('parameter_count', 'unknown')}""")
+        
+        prompt = f"""
+        Analyze each of these {len(batch)} Python functions and provide a refactored version of each that improves:
+        1. Readability
+        2. Maintainability
+        3. Performance
+        4. Code structure
+
+        {BATCH_SEPARATOR.join(records)}
+
+        Answer for every function, in the same order. Format each answer as:
+        REFACTORED_CODE:
+        ```python
+        [refactored code here]
+        ```
+
+        EXPLANATION:
+        [explanation of improvements]
+
+        HELPER_FUNCTIONS:
+        ```python
+        [any helper functions needed]
+        ```
+
+        BEST_PRACTICES:
+        [list of best practices applied]
+
+        Separate consecutive answers with a line containing only:
+        {BATCH_SEPARATOR.strip()}
+        """
+        
+        try:
+            from openai import OpenAI
+            client = OpenAI(api_key=self.api_key)
+            
+            response = client.chat.completions.create(
+                model="gpt-4",
+                messages=[
+                    {"role": "system", "content": "You are an expert Python developer specializing in code refactoring and best practices."},
+                    {"role": "user", "content": prompt}
+                ],
+                max_tokens=REFACTORING_TOKENS * len(batch),
+                temperature=0.3
             )
             
+            choice = response.choices[0]
+            ai_response = choice.message.content or ""
         except Exception as e:
-            print(f"❌ Error generating AI refactoring: {e}")
-            return None
+            print(f"❌ Error generating batched AI refactoring: {e}, retrying individually")
+            return [self.generate_refactoring_suggestion(*item) for item in batch]
+        
+        answers = [answer.strip() for answer in ai_response.split(BATCH_SEPARATOR.strip())]
+        answers = [answer for answer in answers if answer]
+        
+        expected = len(batch)
+        if getattr(choice, "finish_reason", None) == "length" and answers:
+            # The response was cut off, so its last answer is incomplete
+            answers.pop()
+            expected -= 1
+        
+        if len(answers) != expected:
+            # A missing or extra answer shifts every answer after it, so
+            # none of them can be matched back to their functions
+            print(f"⚠️  Batched AI response had {len(answers)} answers for {len(batch)} functions, retrying individually")
+            return [self.generate_refactoring_suggestion(*item) for item in batch]
+        
+        suggestions: List[Optional[AICodeSuggestion]] = [None] * len(batch)
+        for index, answer in enumerate(answers):
+            file_path, function_code, _ = batch[index]
+            suggestion = self._parse_refactoring_response(file_path, function_code, answer)
+            if suggestion.ai_generated_code:
+                suggestions[index] = suggestion
+        
+        # Only the functions without a usable answer cost another call each
+        unparsed = [index for index, suggestion in enumerate(suggestions) if suggestion is None]
+        if unparsed:
+            print(f"⚠️  Batched AI response had no usable answer for {len(unparsed)} of {len(batch)} functions, retrying those individually")
+            for index in unparsed:
+                suggestions[index] = self.generate_refactoring_suggestion(*batch[index])
+        
+        return suggestions
+    
+    def _parse_refactoring_response(self, file_path: str, function_code: str, ai_response: str) -> AICodeSuggestion:
+        """Build a refactoring suggestion from a REFACTORED_CODE/EXPLANATION response."""
+        refactored_code = self._extract_code_block(ai_response, "REFACTORED_CODE")
+        explanation = self._extract_section(ai_response, "EXPLANATION")
+        
+        # If no code was extracted, try to extract any code block
+        if not refactored_code:
+            refactored_code = self._extract_any_code_block(ai_response)
+        
+        return AICodeSuggestion(
+            file_path=file_path,
+            function_name=self._extract_function_name(function_code),
+            suggestion_type="ai_refactoring",
+            description=f"AI-generated refactoring for complex function",
+            original_code=function_code,
+            ai_generated_code=refactored_code,
+            confidence=0.9,
+            reasoning=explanation
+        )
     
     def generate_test_suggestion(self, file_path: str, function_code: str, function_name: str) -> Optional[AICodeSuggestion]:
         """Generate AI-powered test suggestion."""
@@ -7,7 +7,7 @@ import time
 import json
 import hashlib
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Callable, List, Dict, Optional
 from .ignore_patterns import IgnorePatterns
 from .error_handler import ErrorHandler, ErrorSeverity
 
@@ -298,4 +298,96 @@ class CacheManager:
                 {"operation": "get_cache_info"}, 
                 ErrorSeverity.WARNING
             )
-            return {"error": "Failed to get cache info"}
\ No newline at end of file
+            return {"error": "Failed to get cache info"}
+
+
+class FileResultCache:
+    """
+    Per-file analysis results, reused while a file's mtime and size are unchanged.
+    
+    Results live in memory during a run and are written back to one JSON
+    file by save(), so a rerun only re-analyzes the files that changed.
+    `encode` and `decode` convert a result to and from plain JSON data; the
+    cache may sit inside the analyzed repository, so it never holds objects
+    that would run code when loaded.
+    """
+    
+    def __init__(self, cache_file: str, error_handler: Optional[ErrorHandler] = None,
+                 encode: Optional[Callable[[Any], Any]] = None,
+                 decode: Optional[Callable[[Any], Any]] = None):
+        self.cache_file = Path(cache_file)
+        self.error_handler = error_handler or ErrorHandler()
+        self._encode = encode or (lambda result: result)
+        self._decode = decode or (lambda data: data)
+        self._entries: Dict[str, tuple] = {}
+        self._dirty = False
+        self._load()
+    
+    def _load(self):
+        """Read the entries saved by a previous run, if any."""
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self._entries = {
+                file_path: (tuple(key), self._decode(result))
+                for file_path, (key, result) in data.items()
+            }
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            # A corrupt or outdated cache only costs a full re-analysis
+            self._entries = {}
+            self.error_handler.handle_error(
+                e, 
+                {"operation": "load_file_cache", "path": str(self.cache_file)}, 
+                ErrorSeverity.WARNING
+            )
+    
+    @staticmethod
+    def _stat_key(file_path: str) -> Optional[tuple]:
+        """(mtime_ns, size) of a file, or None if it can't be stat'ed."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def get_or_compute(self, file_path: str, compute) -> Any:
+        """Return the cached result for file_path, computing it if the file changed."""
+        key = self._stat_key(file_path)
+        if key is None:
+            return compute(file_path)
+        
+        entry = self._entries.get(file_path)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+        
+        result = compute(file_path)
+        # Failures aren't cached so that they are retried and reported next run
+        if result is not None:
+            self._entries[file_path] = (key, result)
+            self._dirty = True
+        return result
+    
+    def save(self):
+        """Write the entries back if anything changed during this run."""
+        if not self._dirty:
+            return
+        
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            temp_file = self.cache_file.with_suffix('.tmp')
+            data = {
+                file_path: [list(key), self._encode(result)]
+                for file_path, (key, result) in self._entries.items()
+            }
+            with open(temp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp_file, self.cache_file)
+            self._dirty = False
+        except Exception as e:
+            self.error_handler.handle_error(
+                e, 
+                {"operation": "save_file_cache", "path": str(self.cache_file)}, 
+                ErrorSeverity.WARNING
+            )
@@ -7,6 +7,7 @@ import os
 import ast
 import re
 import hashlib
+from collections import Counter
 from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
@@ -36,6 +37,7 @@ class CodeChunk:
     line_end: int = 0
     complexity: int = 0
     dependencies: List[str] = None
+    embedding: Optional[List[float]] = None
 
 
 @dataclass
@@ -415,14 +417,37 @@ class CodebaseIntelligence:
         
         try:
             # Generate query embedding
-            query_embedding = self.embedding_model.encode([query]).tolist()
-            
+            query_embedding = self.encode_query(query)
+        except Exception as e:
+            self.error_handler.handle_error(e, {"operation": "query_codebase", "query": query})
+            return CodebaseContext([], [], {}, [], [])
+        
+        return self.query_codebase_by_embedding(query_embedding, max_results, query)
+    
+    def encode_query(self, query: str) -> List[float]:
+        """Embed a query string with the codebase embedding model."""
+        return self.embedding_model.encode([query])[0].tolist()
+    
+    def embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed several strings in one forward pass of the embedding model."""
+        if not texts:
+            return []
+        return self.embedding_model.encode(list(texts)).tolist()
+    
+    def query_codebase_by_embedding(self, query_embedding: List[float], max_results: int = 10,
+                                    query: str = "") -> CodebaseContext:
+        """Query the codebase with a precomputed query embedding."""
+        if not self.initialized:
+            return CodebaseContext([], [], {}, [], [])
+        
+        try:
             # Search in ChromaDB
             results = self.collection.query(
-                query_embeddings=query_embedding,
+                query_embeddings=[query_embedding],
                 n_results=max_results,
-                include=["documents", "metadatas", "distances"]
+                include=["documents", "metadatas", "distances", "embeddings"]
             )
+            embeddings = results.get('embeddings')
             
             # Convert to CodeChunk objects
             relevant_chunks = []
@@ -439,7 +464,8 @@ class CodebaseIntelligence:
                     class_name=metadata['class_name'] or None,
                     line_start=metadata['line_start'],
                     line_end=metadata['line_end'],
-                    complexity=metadata['complexity']
+                    complexity=metadata['complexity'],
+                    embedding=embeddings[0][i] if embeddings is not None else None
                 )
                 relevant_chunks.append(chunk)
             
@@ -567,13 +593,15 @@ class CodebaseIntelligence:
             total_chunks = len(results['ids'])
             unique_files = len(set(metadata['file_path'] for metadata in results['metadatas']))
             
-            functions = len([m for m in results['metadatas'] if m['chunk_type'] == 'function'])
-            classes = len([m for m in results['metadatas'] if m['chunk_type'] == 'class'])
-            imports = len([m for m in results['metadatas'] if m['chunk_type'] == 'import'])
+            # One pass over the chunk metadata for every type count
+            chunk_types = Counter(m['chunk_type'] for m in results['metadatas'])
+            functions = chunk_types['function']
+            classes = chunk_types['class']
+            imports = chunk_types['import']
             
             complexities = [m['complexity'] for m in results['metadatas'] if m['complexity'] > 0]
             average_complexity = sum(complexities) / len(complexities) if complexities else 0.0
-            high_complexity_functions = len([c for c in complexities if c > 5])
+            high_complexity_functions = sum(1 for c in complexities if c > 5)
             
             return {
                 "total_chunks": total_chunks,
@@ -14,6 +14,7 @@ from enum import Enum
 
 from .error_handler import ErrorHandler
 from .progress_reporter import ProgressReporter
+from .cache_manager import FileResultCache
 
 
 class DependencyType(Enum):
@@ -44,6 +45,18 @@ class Dependency:
             "element_name": self.element_name,
             "is_resolved": self.is_resolved
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Dependency":
+        """Rebuild a dependency from its to_dict() form."""
+        return cls(
+            source_file=data["source_file"],
+            target_file=data["target_file"],
+            dependency_type=DependencyType(data["dependency_type"]),
+            line_number=data["line_number"],
+            element_name=data["element_name"],
+            is_resolved=data["is_resolved"]
+        )
 
 
 @dataclass
@@ -62,6 +75,16 @@ class FileDependencies:
             "exports": self.exports,
             "dependencies": [dep.to_dict() for dep in self.dependencies]
         }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileDependencies":
+        """Rebuild a file's dependencies from their to_dict() form."""
+        return cls(
+            file_path=data["file_path"],
+            imports=[Dependency.from_dict(dep) for dep in data["imports"]],
+            exports=data["exports"],
+            dependencies=[Dependency.from_dict(dep) for dep in data["dependencies"]]
+        )
 
 
 class DependencyMapper:
@@ -70,9 +93,11 @@ class DependencyMapper:
     Focuses on reliability and clean code.
     """
     
-    def __init__(self, error_handler: ErrorHandler, progress_reporter: ProgressReporter):
+    def __init__(self, error_handler: ErrorHandler, progress_reporter: ProgressReporter,
+                 file_cache: Optional[FileResultCache] = None):
         self.error_handler = error_handler
         self.progress_reporter = progress_reporter
+        self.file_cache = file_cache
         self.cache_file = ".dependency_cache/dependencies.json"
         self._ensure_cache_dir()
     
@@ -205,10 +230,14 @@ class DependencyMapper:
         
         results = {}
         processed = 0
+        file_cache = self.file_cache
         
         for file_path in files:
             if file_path.endswith(('.py', '.js', '.jsx', '.ts', '.tsx')):
-                result = self.analyze_file(file_path)
+                if file_cache is not None:
+                    result = file_cache.get_or_compute(file_path, self.analyze_file)
+                else:
+                    result = self.analyze_file(file_path)
                 if result:
                     results[file_path] = result
             
@@ -228,6 +257,9 @@ class DependencyMapper:
             total_directories=0
         )
         
+        if file_cache is not None:
+            file_cache.save()
+        
         return results
     
     def save_dependencies(self, dependencies: Dict[str, FileDependencies]):
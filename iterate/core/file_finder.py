@@ -98,9 +98,19 @@ class FileFinder:
                 directory_path, scan_config["recursive"], scan_config["max_depth"], project_ignore_patterns
             )
             
-            # Get file type statistics
+            # Get file type statistics, reusing content sniffing from earlier runs
+            filetype_cache = None
+            if self.cache_manager and cache_config.get("enabled", True):
+                # Kept in a subdirectory so CacheManager's *.json scan entries
+                # (counted and cleared by glob) never include it
+                filetype_cache = str(self.cache_manager.cache_dir / "filetypes" / "sniff.json")
+                self.file_type_detector.load_cache(filetype_cache)
+            
             file_stats = self.file_type_detector.get_file_stats(files)
             
+            if filetype_cache:
+                self.file_type_detector.save_cache(filetype_cache, seen_paths=files)
+            
             # Create result
             result = {
                 "files": sorted(files),
@@ -136,6 +146,9 @@ class FileFinder:
                 ErrorSeverity.ERROR
             )
             return self._create_error_result(str(e))
+        finally:
+            # No-op after finish_scan; otherwise puts Ctrl+C handling back
+            self.progress_reporter.abort_scan()
     
     def _perform_scan(self, directory_path: Path, recursive: bool, max_depth: int, 
                       ignore_patterns: List[str]) -> Tuple[List[str], List[str], int, int]:
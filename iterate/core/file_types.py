@@ -3,8 +3,10 @@ File type detection and categorization for code analysis.
 """
 
 import os
-from pathlib import Path
-from typing import Dict, List, Set, Optional, Tuple
+import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
 from enum import Enum
 from .error_handler import ErrorHandler, ErrorSeverity
 
@@ -125,6 +127,12 @@ class FileTypeDetector:
             ".ps1": Language.POWERSHELL,
         }
         
+        # Reverse index of languages to their extensions
+        self._lang_to_exts: Dict[Language, List[str]] = {}
+        for ext, lang in self.language_extensions.items():
+            self._lang_to_exts.setdefault(lang, []).append(ext)
+        self._supported_languages = frozenset(self._lang_to_exts)
+        
         # File categories based on extensions
         self.category_extensions = {
             # Code files
@@ -241,9 +249,30 @@ class FileTypeDetector:
             ".pkg": FileCategory.BINARY,
         }
         
+        # Multi-part suffixes such as ".test.js" or "_test.py", which a plain
+        # extension lookup can never match
+        self._multi_suffixes = tuple(
+            key for key in self.category_extensions
+            if key.startswith('_') or key.count('.') > 1
+        )
+        
+        # Single-probe table of (language, category) for language extensions
+        self._ext_info: Dict[str, Tuple[Language, FileCategory]] = {
+            ext: (language, self.category_extensions.get(ext, FileCategory.CODE))
+            for ext, language in self.language_extensions.items()
+        }
+        
+        # Filenames are compared lowercased, so index the keys the same way
+        self._exact_names = {name.lower(): category for name, category in self.category_extensions.items()}
+        
         # Maximum file size for text analysis (10MB)
         self.max_text_file_size = 10 * 1024 * 1024
         
+        # Batches larger than this are detected on a thread pool, since
+        # binary sniffing is disk-bound and releases the GIL
+        self.parallel_threshold = 512
+        self.max_workers = min(32, (os.cpu_count() or 1) * 4)
+        
         # Binary file signatures (first few bytes)
         self.binary_signatures = {
             b'\x89PNG\r\n\x1a\n': 'PNG',
@@ -260,6 +289,11 @@ class FileTypeDetector:
             b'\xfe\xed\xfa\xce': 'MACHO',
             b'\xce\xfa\xed\xfe': 'MACHO',
         }
+        self._binary_sig_tuple = tuple(self.binary_signatures.keys())
+        
+        # Content-sniffing results keyed by path, as (mtime_ns, size, category);
+        # persisted with save_cache/load_cache so unchanged files aren't re-read
+        self._sniff_cache: Dict[str, Tuple[int, int, FileCategory]] = {}
     
     def detect_file_type(self, file_path: str) -> Tuple[Language, FileCategory]:
         """
@@ -272,31 +306,12 @@ class FileTypeDetector:
             Tuple of (Language, FileCategory)
         """
         try:
-            path = Path(file_path)
-            filename = path.name.lower()
-            
-            # Check by extension first
-            extension = path.suffix.lower()
-            if extension in self.language_extensions:
-                language = self.language_extensions[extension]
-                category = self.category_extensions.get(extension, FileCategory.CODE)
-                return language, category
-            
-            # Check by filename (for files without extensions)
-            if filename in self.category_extensions:
-                category = self.category_extensions[filename]
-                return Language.UNKNOWN, category
+            file_type = self._classify_name(os.path.basename(file_path).lower())
+            if file_type is not None:
+                return file_type
             
-            # Check for test files by pattern
-            if self._is_test_file(filename):
-                return Language.UNKNOWN, FileCategory.TEST
-            
-            # Check if it's a binary file
-            if self._is_binary_file(file_path):
-                return Language.UNKNOWN, FileCategory.BINARY
-            
-            # Default to unknown
-            return Language.UNKNOWN, FileCategory.UNKNOWN
+            # Only sniff content for truly unknown extensions
+            return Language.UNKNOWN, self._sniff_category(file_path)
             
         except Exception as e:
             self.error_handler.handle_error(
@@ -305,6 +320,77 @@ class FileTypeDetector:
             )
             return Language.UNKNOWN, FileCategory.UNKNOWN
     
+    def _classify_name(self, filename: str) -> Optional[Tuple[Language, FileCategory]]:
+        """
+        Classify a lowercased filename without touching the disk.
+        
+        Returns:
+            Tuple of (Language, FileCategory), or None if only the file
+            content can tell
+        """
+        # Check by extension first
+        dot = filename.rfind('.')
+        extension = filename[dot:] if dot > 0 else ''
+        ext_info = self._ext_info.get(extension)
+        if ext_info is not None:
+            if filename.endswith(self._multi_suffixes):
+                return ext_info[0], self._suffix_category(filename)
+            return ext_info
+        
+        # Check by filename (for files without extensions)
+        if filename in self._exact_names:
+            category = self._exact_names[filename]
+            return Language.UNKNOWN, category
+        
+        # Check for test files by pattern
+        if self._is_test_file(filename):
+            return Language.UNKNOWN, FileCategory.TEST
+        
+        # Known non-code extensions don't need content inspection
+        if extension in self.category_extensions:
+            return Language.UNKNOWN, self.category_extensions[extension]
+        
+        return None
+    
+    def iter_classified(self, directory: str, sniff_binary: bool = False) -> Iterator[Tuple[str, Tuple[Language, FileCategory]]]:
+        """
+        Classify the files directly inside a directory in one os.scandir pass.
+        
+        Args:
+            directory: Directory to scan (not recursive)
+            sniff_binary: Read the header of files whose name doesn't identify
+                them; when False they are reported as unknown without any I/O
+            
+        Yields:
+            Tuples of (file path, (Language, FileCategory))
+        """
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if not entry.is_file():
+                        continue
+                    
+                    file_type = self._classify_name(entry.name.lower())
+                    if file_type is None:
+                        if sniff_binary:
+                            file_type = (Language.UNKNOWN, self._sniff_category(entry.path))
+                        else:
+                            file_type = (Language.UNKNOWN, FileCategory.UNKNOWN)
+                    yield entry.path, file_type
+        except OSError as e:
+            self.error_handler.handle_error(
+                e,
+                {"operation": "classify_directory", "path": str(directory)},
+                ErrorSeverity.WARNING
+            )
+    
+    def _suffix_category(self, filename: str) -> FileCategory:
+        """Get the category of the multi-part suffix a filename ends with."""
+        for suffix in self._multi_suffixes:
+            if filename.endswith(suffix):
+                return self.category_extensions[suffix]
+        return FileCategory.CODE
+    
     def _is_test_file(self, filename: str) -> bool:
         """Check if filename indicates a test file."""
         test_patterns = [
@@ -313,27 +399,88 @@ class FileTypeDetector:
         ]
         return any(pattern in filename for pattern in test_patterns)
     
+    def _sniff_category(self, file_path: str) -> FileCategory:
+        """Classify a file by content, reusing the cached result if it is unchanged."""
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            stat_result = None
+        
+        if stat_result is not None:
+            cached = self._sniff_cache.get(file_path)
+            if cached is not None and cached[0] == stat_result.st_mtime_ns and cached[1] == stat_result.st_size:
+                return cached[2]
+        
+        category = FileCategory.BINARY if self._is_binary_file(file_path) else FileCategory.UNKNOWN
+        if stat_result is not None:
+            self._sniff_cache[file_path] = (stat_result.st_mtime_ns, stat_result.st_size, category)
+        return category
+    
+    def load_cache(self, cache_file: str):
+        """Load content-sniffing results saved by a previous run."""
+        if not os.path.exists(cache_file):
+            return
+        
+        try:
+            with open(cache_file, 'r') as f:
+                data = json.load(f)
+            for path, (mtime_ns, size, category) in data.items():
+                self._sniff_cache[path] = (mtime_ns, size, FileCategory(category))
+        except (json.JSONDecodeError, IOError, TypeError, ValueError) as e:
+            self.error_handler.handle_error(
+                e,
+                {"operation": "load_filetype_cache", "cache_file": cache_file},
+                ErrorSeverity.WARNING
+            )
+    
+    def save_cache(self, cache_file: str, seen_paths: Optional[Iterable[str]] = None):
+        """
+        Save content-sniffing results for reuse by later runs.
+        
+        If seen_paths is given, entries for any other path (deleted or no
+        longer scanned files) are dropped first so the cache doesn't grow.
+        """
+        try:
+            if seen_paths is not None:
+                seen = set(seen_paths)
+                self._sniff_cache = {
+                    path: entry for path, entry in self._sniff_cache.items() if path in seen
+                }
+            
+            data = {
+                path: [mtime_ns, size, category.value]
+                for path, (mtime_ns, size, category) in self._sniff_cache.items()
+            }
+            os.makedirs(os.path.dirname(cache_file) or ".", exist_ok=True)
+            with open(cache_file, 'w') as f:
+                json.dump(data, f)
+        except Exception as e:
+            self.error_handler.handle_error(
+                e,
+                {"operation": "save_filetype_cache", "cache_file": cache_file},
+                ErrorSeverity.WARNING
+            )
+    
     def _is_binary_file(self, file_path: str) -> bool:
         """Check if file is binary by examining its content."""
         try:
-            # Check file size first
-            if os.path.getsize(file_path) > self.max_text_file_size:
+            # Read the header and size from a single descriptor
+            fd = os.open(file_path, os.O_RDONLY)
+            try:
+                header = os.read(fd, 8)
+                size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+            
+            if size > self.max_text_file_size:
                 return True
             
-            # Read first 8 bytes to check for binary signatures
-            with open(file_path, 'rb') as f:
-                header = f.read(8)
-                
-                # Check for binary signatures
-                for signature, _ in self.binary_signatures.items():
-                    if header.startswith(signature):
-                        return True
-                
-                # Check for null bytes (common in binary files)
-                if b'\x00' in header:
-                    return True
-                    
-                return False
+            # Check for binary signatures
+            if header.startswith(self._binary_sig_tuple):
+                return True
+            
+            # Check for null bytes (common in binary files)
+            return b'\x00' in header
                 
         except Exception as e:
             self.error_handler.handle_error(
@@ -357,9 +504,9 @@ class FileTypeDetector:
         language, category = self.detect_file_type(file_path)
         return category == FileCategory.TEST
     
-    def get_supported_languages(self) -> Set[Language]:
+    def get_supported_languages(self) -> FrozenSet[Language]:
         """Get set of supported programming languages."""
-        return set(self.language_extensions.values())
+        return self._supported_languages
     
     def get_language_by_extension(self, extension: str) -> Optional[Language]:
         """Get language by file extension."""
@@ -367,17 +514,24 @@ class FileTypeDetector:
     
     def get_extensions_by_language(self, language: Language) -> List[str]:
         """Get all extensions for a specific language."""
-        return [ext for ext, lang in self.language_extensions.items() if lang == language]
+        return list(self._lang_to_exts.get(language, []))
     
     def filter_code_files(self, file_paths: List[str]) -> List[str]:
         """Filter list of files to only include code files."""
         return [path for path in file_paths if self.is_code_file(path)]
     
+    def _detect_file_types(self, file_paths: List[str]) -> List[Tuple[Language, FileCategory]]:
+        """Detect file types for a batch of paths, in input order."""
+        if len(file_paths) <= self.parallel_threshold:
+            return [self.detect_file_type(path) for path in file_paths]
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.detect_file_type, file_paths))
+    
     def categorize_files(self, file_paths: List[str]) -> Dict[FileCategory, List[str]]:
         """Categorize files by their type."""
         categories = {}
-        for path in file_paths:
-            _, category = self.detect_file_type(path)
+        for path, (_, category) in zip(file_paths, self._detect_file_types(file_paths)):
             if category not in categories:
                 categories[category] = []
             categories[category].append(path)
@@ -395,29 +549,22 @@ class FileTypeDetector:
             'other_files': []
         }
         
-        for path in file_paths:
-            language, category = self.detect_file_type(path)
-            
-            # Count by language
-            lang_name = language.value
-            if lang_name not in stats['by_language']:
-                stats['by_language'][lang_name] = 0
-            stats['by_language'][lang_name] += 1
-            
-            # Count by category
-            cat_name = category.value
-            if cat_name not in stats['by_category']:
-                stats['by_category'][cat_name] = 0
-            stats['by_category'][cat_name] += 1
-            
-            # Categorize files
-            if category == FileCategory.CODE:
-                stats['code_files'].append(path)
-            elif category == FileCategory.CONFIG:
-                stats['config_files'].append(path)
-            elif category == FileCategory.TEST:
-                stats['test_files'].append(path)
-            else:
-                stats['other_files'].append(path)
+        lang_counter = Counter()
+        cat_counter = Counter()
+        file_lists = {
+            FileCategory.CODE: stats['code_files'],
+            FileCategory.CONFIG: stats['config_files'],
+            FileCategory.TEST: stats['test_files'],
+        }
+        other_files = stats['other_files']
+        
+        for path, (language, category) in zip(file_paths, self._detect_file_types(file_paths)):
+            lang_counter[language] += 1
+            cat_counter[category] += 1
+            file_lists.get(category, other_files).append(path)
+        
+        # Enum members are counted directly; names are only needed for output
+        stats['by_language'] = {language.value: count for language, count in lang_counter.items()}
+        stats['by_category'] = {category.value: count for category, count in cat_counter.items()}
         
         return stats 
\ No newline at end of file
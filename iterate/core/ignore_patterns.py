@@ -3,10 +3,13 @@ File and directory ignore patterns for filtering during scans.
 """
 
 import fnmatch
-from pathlib import Path
+import re
 from typing import List, Optional
 from .error_handler import ErrorHandler, ErrorSeverity
 
+# Characters that make a pattern a glob rather than a literal name
+_GLOB_CHARS = frozenset("*?[")
+
 
 class IgnorePatterns:
     """Handles ignore patterns for filtering files and directories."""
@@ -57,8 +60,6 @@ class IgnorePatterns:
             "*.swp",
             "*.swo",
             "*~",
-            ".DS_Store",
-            "Thumbs.db",
             
             # Logs and temporary files
             "*.log",
@@ -82,10 +83,51 @@ class IgnorePatterns:
             "*.cache"
         ]
         
-        # Combine default and custom patterns
-        self.patterns = self.default_patterns.copy()
-        if custom_patterns:
-            self.patterns.extend(custom_patterns)
+        # Combine default and custom patterns, dropping duplicates in order
+        # and normalizing separators once so matching never has to
+        combined = self.default_patterns + (custom_patterns or [])
+        self.patterns = list(dict.fromkeys(p.replace("\\", "/") for p in combined))
+        
+        self._compile_patterns()
+    
+    def _compile_patterns(self):
+        """
+        Split patterns by shape so most checks are set lookups.
+        
+        Plain component names (".git", "node_modules") go into a set and
+        "*.ext" patterns into a set of extensions; only the remaining globs
+        are compiled, into a single alternation regex.
+        """
+        self._pattern_set = set(self.patterns)
+        literal_names = set()
+        suffixes = set()
+        globs = []
+        dir_globs = []
+        
+        for pattern in self.patterns:
+            if pattern.endswith("/"):
+                # Directory-specific patterns also match without the trailing slash
+                dir_globs.append(pattern[:-1])
+                globs.append(pattern)
+            elif not _GLOB_CHARS.intersection(pattern) and "/" not in pattern:
+                literal_names.add(pattern)
+            elif pattern.startswith("*.") and not _GLOB_CHARS.intersection(pattern[2:]) \
+                    and "." not in pattern[2:] and "/" not in pattern:
+                suffixes.add(pattern[2:])
+            else:
+                globs.append(pattern)
+        
+        self._literal_names = frozenset(literal_names)
+        self._suffixes = frozenset(suffixes)
+        self._glob_regex = self._compile_union(globs)
+        self._dir_regex = self._compile_union(dir_globs)
+    
+    @staticmethod
+    def _compile_union(patterns: List[str]) -> Optional["re.Pattern"]:
+        """Compile glob patterns into one regex matching any of them."""
+        if not patterns:
+            return None
+        return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
     
     def should_ignore(self, path: str, is_dir: bool = False) -> bool:
         """
@@ -99,27 +141,35 @@ class IgnorePatterns:
             True if path should be ignored, False otherwise
         """
         try:
-            # Normalize path separators
+            # Normalize path separators and split into components, skipping
+            # the empty and "." entries that Path.parts would drop
             path_normalized = str(path).replace("\\", "/")
-            path_parts = Path(path).parts
+            path_parts = [part for part in path_normalized.split("/") if part and part != "."]
+            
+            # Literal names are matched against all parts in one C-level call
+            if not self._literal_names.isdisjoint(path_parts):
+                return True
+            
+            suffixes = self._suffixes
+            for part in path_parts:
+                dot = part.rfind(".")
+                if dot != -1 and part[dot + 1:] in suffixes:
+                    return True
             
-            for pattern in self.patterns:
-                pattern = pattern.replace("\\", "/")
-                
-                # Check if pattern matches the full path
-                if fnmatch.fnmatch(path_normalized, pattern):
+            # Remaining globs match the full path or any part of it
+            glob_regex = self._glob_regex
+            if glob_regex is not None:
+                if glob_regex.match(path_normalized):
                     return True
-                
-                # Check if pattern matches any part of the path
                 for part in path_parts:
-                    if fnmatch.fnmatch(part, pattern):
-                        return True
-                
-                # Handle directory-specific patterns
-                if is_dir and pattern.endswith("/"):
-                    if fnmatch.fnmatch(path_normalized, pattern[:-1]):
+                    if glob_regex.match(part):
                         return True
             
+            # Handle directory-specific patterns
+            if is_dir and self._dir_regex is not None:
+                if self._dir_regex.match(path_normalized):
+                    return True
+            
             return False
             
         except Exception as e:
@@ -133,13 +183,17 @@ class IgnorePatterns:
     
     def add_pattern(self, pattern: str):
         """Add a custom ignore pattern."""
-        if pattern not in self.patterns:
+        pattern = pattern.replace("\\", "/")
+        if pattern not in self._pattern_set:
             self.patterns.append(pattern)
+            self._compile_patterns()
     
     def remove_pattern(self, pattern: str):
         """Remove an ignore pattern."""
-        if pattern in self.patterns:
+        pattern = pattern.replace("\\", "/")
+        if pattern in self._pattern_set:
             self.patterns.remove(pattern)
+            self._compile_patterns()
     
     def get_patterns(self) -> List[str]:
         """Get all current ignore patterns."""
@@ -147,4 +201,5 @@ class IgnorePatterns:
     
     def clear_custom_patterns(self):
         """Clear all custom patterns, keeping only defaults."""
-        self.patterns = self.default_patterns.copy()
\ No newline at end of file
+        self.patterns = self.default_patterns.copy()
+        self._compile_patterns()
\ No newline at end of file
@@ -3,18 +3,63 @@ Intelligent AI Generator that combines RAG (CodebaseIntelligence) with AI genera
 Provides context-aware code analysis and suggestions.
 """
 
+import ast
+import mmap
 import os
-from typing import Dict, List, Any, Optional
+import re
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Set, Tuple
 from dataclasses import dataclass
 
+import numpy as np
+
 from .codebase_intelligence import CodebaseIntelligence, CodebaseContext
 from .ai_code_generator import AICodeGenerator, AICodeSuggestion
 from .dependency_mapper import DependencyMapper
 from .error_handler import ErrorHandler
 from .progress_reporter import ProgressReporter
 
+# Cosine similarity above which a cached query answers a new one
+SEMANTIC_CACHE_THRESHOLD = 0.95
+
+# Cosine similarity above which two code chunks count as duplicates
+DUPLICATE_SIMILARITY_THRESHOLD = 0.9
+
+# Common patterns probed for duplicate code
+_DUPLICATE_PATTERNS = (
+    "input validation",
+    "error handling",
+    "data processing",
+    "utility functions",
+    "configuration loading",
+)
+
+# Common patterns probed for cross-file refactoring opportunities
+_CROSS_FILE_PATTERNS = (
+    "import statements",
+    "configuration",
+    "logging setup",
+    "database connection",
+    "API client",
+)
+
+# Every probe pattern once, in order; embedded together at initialization
+_ALL_PATTERNS = tuple(dict.fromkeys(_DUPLICATE_PATTERNS + _CROSS_FILE_PATTERNS))
+
+# Function definitions, for sources that don't parse as Python
+_DEF_RE = re.compile(r'^[ \t]*def[ \t]+([A-Za-z_]\w*)', re.MULTILINE)
 
-@dataclass
+# Any "def" keyword; files without one have no functions to test
+_DEF_KEYWORD_RE = re.compile(rb'\bdef[ \t]+[A-Za-z_]')
+
+# Results per pattern query for duplicates and for cross-file opportunities
+DUPLICATE_QUERY_RESULTS = 10
+CROSS_FILE_QUERY_RESULTS = 15
+
+
+@dataclass(slots=True)
 class IntelligentSuggestion:
     """An intelligent suggestion with context."""
     suggestion: AICodeSuggestion
@@ -34,11 +79,27 @@ class IntelligentAIGenerator:
         self.dependency_mapper = None
         self.directory = None
         
+        # Query results by exact (query, max_results), plus normalized query
+        # embeddings for near-duplicate lookups; cleared when files change
+        self._query_cache: Dict[Tuple[str, int], CodebaseContext] = {}
+        self._semantic_cache: List[Tuple[np.ndarray, int, CodebaseContext]] = []
+        self._query_cache_lock = threading.Lock()
+        
+        # Normalized embeddings of the fixed probe patterns, computed once
+        self._pattern_embeddings: Dict[str, np.ndarray] = {}
+        
+        # Files defining each function name, for cross-file impact lookups
+        self._fn_index: Dict[str, Set[str]] = defaultdict(set)
+        
     def initialize_codebase(self, directory: str) -> bool:
         """Initialize the codebase intelligence system."""
         try:
             self.directory = directory
             
+            # Results and embeddings from a previous codebase don't apply here
+            self._clear_query_cache()
+            self._pattern_embeddings = {}
+            
             # Initialize components
             self.codebase_intelligence = CodebaseIntelligence(error_handler=self.error_handler)
             self.ai_generator = AICodeGenerator()
@@ -54,6 +115,8 @@ class IntelligentAIGenerator:
             success = self.codebase_intelligence.initialize(directory)
             
             if success:
+                self._build_function_index()
+                self._embed_patterns()
                 self.initialized = True
                 return True
             else:
@@ -75,33 +138,40 @@ class IntelligentAIGenerator:
             if not context.relevant_chunks:
                 return []
             
-            suggestions = []
+            # Collect the chunks worth refactoring and send them in batched prompts
+            qualifying = [
+                chunk for chunk in context.relevant_chunks
+                if chunk.chunk_type == "function" and chunk.complexity > 3
+            ]
+            if not qualifying:
+                return []
             
-            # Generate suggestions for each relevant chunk
-            for chunk in context.relevant_chunks:
-                if chunk.chunk_type == "function" and chunk.complexity > 3:
-                    # Generate AI refactoring suggestion
-                    ai_suggestion = self.ai_generator.generate_refactoring_suggestion(
-                        chunk.file_path,
-                        chunk.content,
-                        {"cyclomatic_complexity": chunk.complexity, "lines_of_code": len(chunk.content.split('\n'))}
+            ai_suggestions = self.ai_generator.generate_refactoring_suggestions_batch([
+                (
+                    chunk.file_path,
+                    chunk.content,
+                    {"cyclomatic_complexity": chunk.complexity, "lines_of_code": chunk.content.count('\n') + 1}
+                )
+                for chunk in qualifying
+            ])
+            
+            suggestions = []
+            for chunk, ai_suggestion in zip(qualifying, ai_suggestions):
+                if ai_suggestion:
+                    # Calculate confidence based on complexity and context relevance
+                    confidence = min(0.9, 0.5 + (chunk.complexity * 0.1))
+                    
+                    # Get cross-file impact
+                    cross_file_impact = self._get_cross_file_impact(chunk, context)
+                    
+                    intelligent_suggestion = IntelligentSuggestion(
+                        suggestion=ai_suggestion,
+                        confidence_score=confidence,
+                        reasoning=f"High complexity function ({chunk.complexity}) with {len(context.related_files)} related files",
+                        cross_file_impact=cross_file_impact
                     )
                     
-                    if ai_suggestion:
-                        # Calculate confidence based on complexity and context relevance
-                        confidence = min(0.9, 0.5 + (chunk.complexity * 0.1))
-                        
-                        # Get cross-file impact
-                        cross_file_impact = self._get_cross_file_impact(chunk, context)
-                        
-                        intelligent_suggestion = IntelligentSuggestion(
-                            suggestion=ai_suggestion,
-                            confidence_score=confidence,
-                            reasoning=f"High complexity function ({chunk.complexity}) with {len(context.related_files)} related files",
-                            cross_file_impact=cross_file_impact
-                        )
-                        
-                        suggestions.append(intelligent_suggestion)
+                    suggestions.append(intelligent_suggestion)
             
             return suggestions
             
@@ -121,35 +191,7 @@ class IntelligentAIGenerator:
             if summary["total_chunks"] == 0:
                 return []
             
-            # Query for similar patterns
-            duplicates = []
-            
-            # Look for common patterns
-            patterns = [
-                "input validation",
-                "error handling",
-                "data processing",
-                "utility functions",
-                "configuration loading"
-            ]
-            
-            for pattern in patterns:
-                context = self.codebase_intelligence.query_codebase(pattern, max_results=10)
-                
-                if len(context.relevant_chunks) > 1:
-                    # Group by similarity
-                    grouped_chunks = self._group_similar_chunks(context.relevant_chunks)
-                    
-                    for group in grouped_chunks:
-                        if len(group) > 1:
-                            duplicate = {
-                                "function_name": pattern,
-                                "occurrences": len(group),
-                                "files": [chunk.file_path for chunk in group],
-                                "suggestion": f"Consider extracting '{pattern}' into a shared utility function"
-                            }
-                            duplicates.append(duplicate)
-            
+            duplicates, _ = self._analyze_patterns(_DUPLICATE_PATTERNS, ())
             return duplicates
             
         except Exception as e:
@@ -168,28 +210,7 @@ class IntelligentAIGenerator:
             if summary["unique_files"] < 2:
                 return []
             
-            opportunities = []
-            
-            # Look for common patterns across files
-            patterns = [
-                "import statements",
-                "configuration",
-                "logging setup",
-                "database connection",
-                "API client"
-            ]
-            
-            for pattern in patterns:
-                context = self.codebase_intelligence.query_codebase(pattern, max_results=15)
-                
-                if len(context.related_files) > 1:
-                    opportunity = {
-                        "pattern": pattern,
-                        "files_affected": context.related_files,
-                        "suggestion": f"Consider creating a shared module for {pattern}"
-                    }
-                    opportunities.append(opportunity)
-            
+            _, opportunities = self._analyze_patterns((), _CROSS_FILE_PATTERNS)
             return opportunities
             
         except Exception as e:
@@ -203,23 +224,24 @@ class IntelligentAIGenerator:
         
         try:
             # Query codebase for context about the target file
-            context = self.codebase_intelligence.query_codebase(f"test {target_file}", max_results=5)
+            context = self._cached_query(f"test {target_file}", max_results=5)
             
             # Get the target file content
             if not os.path.exists(target_file):
                 return None
             
-            with open(target_file, 'r', encoding='utf-8') as f:
-                file_content = f.read()
+            with open(target_file, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    # Scan the mapped bytes first so files without functions
+                    # are rejected without being decoded
+                    if not _DEF_KEYWORD_RE.search(mapped):
+                        return None
+                    file_content = mapped[:].decode('utf-8')
             
             # Find functions in the target file
-            functions = []
-            lines = file_content.split('\n')
-            
-            for i, line in enumerate(lines):
-                if line.strip().startswith('def '):
-                    function_name = line.split('def ')[1].split('(')[0].strip()
-                    functions.append(function_name)
+            functions = self._find_function_names(file_content)
             
             if not functions:
                 return None
@@ -249,18 +271,16 @@ class IntelligentAIGenerator:
             # Get basic summary
             summary = self.codebase_intelligence.get_codebase_summary()
             
-            # Get duplicates
-            duplicates = self.find_duplicate_code()
-            total_duplicates = len(duplicates)
-            
-            # Get cross-file opportunities
-            opportunities = self.suggest_cross_file_refactoring()
-            total_opportunities = len(opportunities)
+            # Duplicates and cross-file opportunities share one query per pattern
+            duplicates, opportunities = self._analyze_patterns(
+                _DUPLICATE_PATTERNS if summary["total_chunks"] > 0 else (),
+                _CROSS_FILE_PATTERNS if summary["unique_files"] >= 2 else ()
+            )
             
             return {
                 "summary": summary,
-                "total_duplicates": total_duplicates,
-                "total_opportunities": total_opportunities
+                "total_duplicates": len(duplicates),
+                "total_opportunities": len(opportunities)
             }
             
         except Exception as e:
@@ -273,52 +293,262 @@ class IntelligentAIGenerator:
             return False
         
         try:
-            return self.codebase_intelligence.update_context(file_path)
+            self._clear_query_cache()
+            updated = self.codebase_intelligence.update_context(file_path)
+            self._reindex_file_functions(file_path)
+            return updated
         except Exception as e:
             self.error_handler.handle_error(e, {"operation": "update_context_for_file", "file_path": file_path})
             return False
     
+    def _analyze_patterns(self, duplicate_patterns: Tuple[str, ...],
+                          opportunity_patterns: Tuple[str, ...]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Find duplicates and cross-file opportunities in a single query pass.
+        
+        Each distinct pattern is queried once. Results come back ordered by
+        distance, so duplicates look at the top DUPLICATE_QUERY_RESULTS chunks
+        of the wider query that opportunities need.
+        """
+        patterns = list(dict.fromkeys(duplicate_patterns + opportunity_patterns))
+        max_results = CROSS_FILE_QUERY_RESULTS if opportunity_patterns else DUPLICATE_QUERY_RESULTS
+        contexts = dict(self._query_patterns(patterns, max_results=max_results))
+        
+        duplicates = []
+        for pattern in duplicate_patterns:
+            relevant_chunks = contexts[pattern].relevant_chunks[:DUPLICATE_QUERY_RESULTS]
+            if not self._may_contain_duplicates(relevant_chunks):
+                continue
+            
+            # Group by similarity
+            for group in self._group_similar_chunks(relevant_chunks):
+                if len(group) > 1:
+                    duplicates.append({
+                        "function_name": pattern,
+                        "occurrences": len(group),
+                        "files": [chunk.file_path for chunk in group],
+                        "suggestion": f"Consider extracting '{pattern}' into a shared utility function"
+                    })
+        
+        opportunities = []
+        for pattern in opportunity_patterns:
+            context = contexts[pattern]
+            if len(context.related_files) > 1:
+                opportunities.append({
+                    "pattern": pattern,
+                    "files_affected": context.related_files,
+                    "suggestion": f"Consider creating a shared module for {pattern}"
+                })
+        
+        return duplicates, opportunities
+    
+    def _cached_query(self, query: str, max_results: int) -> CodebaseContext:
+        """Query the codebase, reusing results for identical or near-identical queries."""
+        key = (query, max_results)
+        context = self._query_cache.get(key)
+        if context is not None:
+            return context
+        
+        embedding = self._embed_query(query)
+        context = self._lookup_similar_query(key, embedding)
+        if context is not None:
+            return context
+        
+        context = self.codebase_intelligence.query_codebase_by_embedding(embedding.tolist(), max_results, query)
+        self._store_query_result(key, embedding, context)
+        return context
+    
+    def _embed_query(self, query: str) -> np.ndarray:
+        """Normalized query embedding, precomputed for the probe patterns."""
+        embedding = self._pattern_embeddings.get(query)
+        if embedding is None:
+            embedding = self._normalize(self.codebase_intelligence.encode_query(query))
+        return embedding
+    
+    def _lookup_similar_query(self, key: Tuple[str, int], embedding: np.ndarray) -> Optional[CodebaseContext]:
+        """Return the cached result of a near-identical query, if there is one."""
+        # Compare against every cached query embedding in one matrix product
+        with self._query_cache_lock:
+            candidates = [(cached, ctx) for cached, size, ctx in self._semantic_cache if size == key[1]]
+        if not candidates:
+            return None
+        
+        scores = np.stack([cached for cached, _ in candidates]) @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] < SEMANTIC_CACHE_THRESHOLD:
+            return None
+        
+        context = candidates[best][1]
+        with self._query_cache_lock:
+            self._query_cache[key] = context
+        return context
+    
+    def _store_query_result(self, key: Tuple[str, int], embedding: np.ndarray, context: CodebaseContext):
+        """Cache a query result for exact and near-identical lookups."""
+        # Empty results may come from a failed query, so don't pin them
+        if context.relevant_chunks:
+            with self._query_cache_lock:
+                self._query_cache[key] = context
+                self._semantic_cache.append((embedding, key[1], context))
+    
+    def _embed_patterns(self):
+        """Embed all probe patterns in one batch so pattern queries skip the model."""
+        try:
+            embeddings = self.codebase_intelligence.embed_batch(list(_ALL_PATTERNS))
+            self._pattern_embeddings = {
+                pattern: self._normalize(embedding)
+                for pattern, embedding in zip(_ALL_PATTERNS, embeddings)
+            }
+        except Exception as e:
+            # Pattern queries fall back to embedding on demand
+            self.error_handler.handle_error(e, {"operation": "embed_patterns"})
+            self._pattern_embeddings = {}
+    
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        """Return the embedding as a unit-length float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+    
+    def _clear_query_cache(self):
+        """Forget cached query results, e.g. after the codebase changed."""
+        with self._query_cache_lock:
+            self._query_cache.clear()
+            self._semantic_cache.clear()
+    
+    def _query_patterns(self, patterns: List[str], max_results: int) -> List[Tuple[str, CodebaseContext]]:
+        """
+        Query the codebase for several patterns concurrently, keeping their order.
+        
+        Cache lookups happen before the batch and inserts after it, in pattern
+        order, so which queries hit the cache doesn't depend on thread timing.
+        """
+        if len(patterns) <= 1:
+            return [(pattern, self._cached_query(pattern, max_results)) for pattern in patterns]
+        
+        keys = [(pattern, max_results) for pattern in patterns]
+        embeddings = [self._embed_query(pattern) for pattern in patterns]
+        contexts = [
+            self._query_cache.get(key) or self._lookup_similar_query(key, embedding)
+            for key, embedding in zip(keys, embeddings)
+        ]
+        misses = [index for index, context in enumerate(contexts) if context is None]
+        
+        if misses:
+            # Each query is an embedding + vector DB round-trip, so they overlap well
+            with ThreadPoolExecutor(max_workers=min(8, len(misses))) as executor:
+                fetched = list(executor.map(
+                    lambda index: self.codebase_intelligence.query_codebase_by_embedding(
+                        embeddings[index].tolist(), max_results, patterns[index]
+                    ),
+                    misses
+                ))
+            
+            for index, context in zip(misses, fetched):
+                contexts[index] = context
+                self._store_query_result(keys[index], embeddings[index], context)
+        
+        return list(zip(patterns, contexts))
+    
+    @staticmethod
+    def _find_function_names(source: str) -> List[str]:
+        """Return function names defined in source, in source order."""
+        try:
+            tree = ast.parse(source)
+        except (SyntaxError, ValueError):
+            return _DEF_RE.findall(source)
+        
+        nodes = [
+            node for node in ast.walk(tree)
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+        ]
+        nodes.sort(key=lambda node: (node.lineno, node.col_offset))
+        return [node.name for node in nodes]
+    
+    def _build_function_index(self):
+        """Index which files define each function name across all processed chunks."""
+        self._fn_index = defaultdict(set)
+        for chunk in self.codebase_intelligence.chunks:
+            if chunk.function_name:
+                self._fn_index[chunk.function_name].add(chunk.file_path)
+    
+    def _reindex_file_functions(self, file_path: str):
+        """Refresh the function index entries for a single changed file."""
+        for function_name in [name for name, files in self._fn_index.items() if file_path in files]:
+            files = self._fn_index[function_name]
+            files.discard(file_path)
+            if not files:
+                del self._fn_index[function_name]
+        
+        for chunk in self.codebase_intelligence.chunks:
+            if chunk.file_path == file_path and chunk.function_name:
+                self._fn_index[chunk.function_name].add(file_path)
+    
     def _get_cross_file_impact(self, chunk, context: CodebaseContext) -> List[str]:
         """Get cross-file impact for a chunk."""
-        impact_files = []
+        # Other files defining the same function name are affected by a change
+        if not chunk.function_name:
+            return []
         
-        # Check if this function is used in other files
-        if chunk.function_name:
-            # Query for function usage
-            usage_context = self.codebase_intelligence.query_codebase(chunk.function_name, max_results=10)
-            
-            for usage_chunk in usage_context.relevant_chunks:
-                if usage_chunk.file_path != chunk.file_path:
-                    impact_files.append(usage_chunk.file_path)
+        impact = self._fn_index.get(chunk.function_name)
+        if not impact:
+            return []
+        return sorted(impact - {chunk.file_path})
+    
+    @staticmethod
+    def _may_contain_duplicates(chunks) -> bool:
+        """Cheap check for whether grouping the chunks could find anything."""
+        if len(chunks) <= 1:
+            return False
         
-        return list(set(impact_files))
+        # Embedding similarity can group any chunks; without embeddings only
+        # a shared name and type can, so all-distinct keys means no groups
+        if all(chunk.embedding is not None for chunk in chunks):
+            return True
+        return len({(chunk.function_name, chunk.chunk_type) for chunk in chunks}) < len(chunks)
     
     def _group_similar_chunks(self, chunks) -> List[List]:
-        """Group chunks by similarity."""
+        """Group chunks that are semantically similar or share a name and type."""
         if len(chunks) <= 1:
             return []
         
-        groups = []
-        processed = set()
+        # Union-find over chunk indices
+        parent = list(range(len(chunks)))
         
-        for i, chunk1 in enumerate(chunks):
-            if i in processed:
-                continue
-            
-            group = [chunk1]
-            processed.add(i)
-            
-            for j, chunk2 in enumerate(chunks[i+1:], i+1):
-                if j in processed:
-                    continue
-                
-                # Simple similarity check (could be enhanced with embeddings)
-                if (chunk1.function_name == chunk2.function_name and 
-                    chunk1.chunk_type == chunk2.chunk_type):
-                    group.append(chunk2)
-                    processed.add(j)
-            
-            if len(group) > 1:
-                groups.append(group)
+        def find(index: int) -> int:
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+        
+        def union(first: int, second: int):
+            root_first, root_second = find(first), find(second)
+            if root_first != root_second:
+                parent[max(root_first, root_second)] = min(root_first, root_second)
+        
+        # Chunks with the same function name and type are always grouped
+        first_by_key = {}
+        for index, chunk in enumerate(chunks):
+            key = (chunk.function_name, chunk.chunk_type)
+            if key in first_by_key:
+                union(first_by_key[key], index)
+            else:
+                first_by_key[key] = index
+        
+        # Cluster by cosine similarity of the stored embeddings, in one matmul
+        if all(chunk.embedding is not None for chunk in chunks):
+            embeddings = np.asarray([chunk.embedding for chunk in chunks], dtype=np.float32)
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            embeddings /= norms
+            
+            similar = np.triu(embeddings @ embeddings.T > DUPLICATE_SIMILARITY_THRESHOLD, k=1)
+            for first, second in zip(*np.nonzero(similar)):
+                union(int(first), int(second))
+        
+        groups = defaultdict(list)
+        for index, chunk in enumerate(chunks):
+            groups[find(index)].append(chunk)
         
-        return groups
+        return [group for group in groups.values() if len(group) > 1]
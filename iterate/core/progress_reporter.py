@@ -2,12 +2,25 @@
 Progress reporting for file discovery operations.
 """
 
+import signal
+import threading
 import time
 import sys
 from typing import Dict, List, Optional, Callable
 from dataclasses import dataclass
 from enum import Enum
 
+# Updates between checks of the display interval clock once something has
+# been drawn; kept small since some callers only report every few files
+_CLOCK_CHECK_EVERY = 8
+
+# Every possible simple progress bar, indexed by filled length
+_BAR_LEN = 30
+_BARS = tuple('█' * i + '-' * (_BAR_LEN - i) for i in range(_BAR_LEN + 1))
+
+# Line template for the simple progress bar
+_SIMPLE_PROGRESS_TEMPLATE = "\rProgress: [{}] {:.1f}% ({}/{}){}"
+
 
 class ProgressType(Enum):
     """Types of progress reporting."""
@@ -17,7 +30,7 @@ class ProgressType(Enum):
     VERBOSE = "verbose"
 
 
-@dataclass
+@dataclass(slots=True)
 class ProgressState:
     """Current state of progress."""
     current_file: str = ""
@@ -43,21 +56,36 @@ class ProgressReporter:
         self.state = ProgressState()
         self.callbacks: List[Callable] = []
         self.cancelled = False
+        self._silent = progress_type == ProgressType.SILENT
+        
+        # Last (filled length, rounded percentage) drawn by the simple bar,
+        # to skip redraws that would look the same
+        self._last_bar_key = None
+        self._update_counter = 0
+        self._has_drawn = False
+        
+        # SIGINT handler replaced while a scan runs, restored when it ends
+        self._previous_sigint = None
+        self._sigint_installed = False
         
         # Setup start time
-        self.state.start_time = time.time()
+        self.state.start_time = time.monotonic()
         self.state.last_update_time = self.state.start_time
     
     def start_scan(self, directory: str, estimated_files: int = 0, estimated_dirs: int = 0):
         """Start a new scan operation."""
         self.state = ProgressState()
-        self.state.start_time = time.time()
+        self.state.start_time = time.monotonic()
         self.state.last_update_time = self.state.start_time
         self.state.estimated_total_files = estimated_files
         self.state.estimated_total_directories = estimated_dirs
         self.cancelled = False
+        self._last_bar_key = None
+        self._update_counter = 0
+        self._has_drawn = False
+        self._install_interrupt_handler()
         
-        if self.progress_type != ProgressType.SILENT:
+        if not self._silent:
             print(f"Starting scan of: {directory}")
             if estimated_files > 0 or estimated_dirs > 0:
                 print(f"Estimated: {estimated_files} files, {estimated_dirs} directories")
@@ -67,6 +95,15 @@ class ProgressReporter:
                        files_processed: int = 0, directories_processed: int = 0,
                        total_files_found: int = 0, total_directories_found: int = 0):
         """Update progress state and display if needed."""
+        # Ctrl+C only flags the scan; stop it here, between items
+        if self.cancelled:
+            self._restore_interrupt_handler()
+            raise KeyboardInterrupt
+        
+        # Nothing is shown and nobody is listening, so skip the bookkeeping
+        if self._silent and not self.callbacks:
+            return
+        
         # Update state
         if current_file:
             self.state.current_file = current_file
@@ -81,22 +118,26 @@ class ProgressReporter:
         if total_directories_found > 0:
             self.state.total_directories_found = total_directories_found
         
-        # Check if we should update display
-        current_time = time.time()
+        # Check if we should update display, consulting the clock only every
+        # few updates since tight scan loops call this per file; until the
+        # first draw it is checked every time so short scans still show progress
+        counter = self._update_counter
+        self._update_counter = counter + 1
+        if counter % _CLOCK_CHECK_EVERY and self._has_drawn:
+            return
+        
+        current_time = time.monotonic()
         if (current_time - self.state.last_update_time) >= self.update_interval:
             self._display_progress()
             self.state.last_update_time = current_time
-        
-        # Check for cancellation
-        if self._check_cancellation():
-            self.cancelled = True
+            self._has_drawn = True
     
     def _display_progress(self):
         """Display current progress based on type."""
-        if self.progress_type == ProgressType.SILENT:
+        if self._silent:
             return
         
-        elapsed_time = time.time() - self.state.start_time
+        elapsed_time = time.monotonic() - self.state.start_time
         
         if self.progress_type == ProgressType.SIMPLE:
             self._display_simple_progress(elapsed_time)
@@ -112,36 +153,47 @@ class ProgressReporter:
         
         if total_items > 0:
             percentage = (processed_items / total_items) * 100
-            bar_length = 30
-            filled_length = int(bar_length * processed_items // total_items)
-            bar = '█' * filled_length + '-' * (bar_length - filled_length)
+            filled_length = min(_BAR_LEN, max(0, _BAR_LEN * processed_items // total_items))
+            
+            bar_key = (filled_length, round(percentage, 1))
+            if bar_key == self._last_bar_key:
+                return
+            self._last_bar_key = bar_key
+            bar = _BARS[filled_length]
             
             eta_str = ""
             if self.show_eta and processed_items > 0:
                 eta = self._calculate_eta(processed_items, total_items, elapsed_time)
                 eta_str = f" | ETA: {eta}"
             
-            print(f"\rProgress: [{bar}] {percentage:.1f}% ({processed_items}/{total_items}){eta_str}", 
-                  end="", flush=True)
+            self._write(_SIMPLE_PROGRESS_TEMPLATE.format(bar, percentage, processed_items, total_items, eta_str))
     
     def _display_detailed_progress(self, elapsed_time: float):
         """Display detailed progress information."""
-        total_items = self.state.total_files_found + self.state.total_directories_found
-        processed_items = self.state.files_processed + self.state.directories_processed
+        state = self.state
+        parts = [
+            f"\rFiles: {state.files_processed}/{state.total_files_found} | "
+            f"Dirs: {state.directories_processed}/{state.total_directories_found} | "
+            f"Time: {elapsed_time:.1f}s"
+        ]
         
-        print(f"\rFiles: {self.state.files_processed}/{self.state.total_files_found} | "
-              f"Dirs: {self.state.directories_processed}/{self.state.total_directories_found} | "
-              f"Time: {elapsed_time:.1f}s", end="", flush=True)
+        if state.current_directory and self.progress_type == ProgressType.VERBOSE:
+            parts.append(f" | Current: {state.current_directory}")
         
-        if self.state.current_directory and self.progress_type == ProgressType.VERBOSE:
-            print(f" | Current: {self.state.current_directory}", end="")
+        self._write(''.join(parts))
     
     def _display_verbose_progress(self, elapsed_time: float):
         """Display verbose progress with current file/directory."""
-        print(f"\r[{elapsed_time:.1f}s] Files: {self.state.files_processed} | "
-              f"Dirs: {self.state.directories_processed} | "
-              f"Current: {self.state.current_directory or self.state.current_file}", 
-              end="", flush=True)
+        state = self.state
+        self._write(f"\r[{elapsed_time:.1f}s] Files: {state.files_processed} | "
+                    f"Dirs: {state.directories_processed} | "
+                    f"Current: {state.current_directory or state.current_file}")
+    
+    @staticmethod
+    def _write(line: str):
+        """Write a progress line in one call and flush it; display is already throttled."""
+        sys.stdout.write(line)
+        sys.stdout.flush()
     
     def _calculate_eta(self, processed: int, total: int, elapsed: float) -> str:
         """Calculate estimated time remaining."""
@@ -159,20 +211,18 @@ class ProgressReporter:
         else:
             return f"{eta_seconds/3600:.1f}h"
     
-    def _check_cancellation(self) -> bool:
-        """Check if user wants to cancel (Ctrl+C)."""
-        try:
-            # This is a simple check - in practice you might want more sophisticated handling
-            return False
-        except KeyboardInterrupt:
-            return True
-    
     def finish_scan(self, total_files: int, total_directories: int, 
                    errors: Optional[Dict] = None):
         """Finish the scan and display final results."""
-        total_time = time.time() - self.state.start_time
+        self._restore_interrupt_handler()
+        
+        # Ctrl+C pressed after the last progress update still stops the scan
+        if self.cancelled:
+            raise KeyboardInterrupt
         
-        if self.progress_type != ProgressType.SILENT:
+        total_time = time.monotonic() - self.state.start_time
+        
+        if not self._silent:
             print()  # New line after progress bar
             print("-" * 50)
             print(f"Scan completed in {total_time:.2f} seconds")
@@ -190,6 +240,42 @@ class ProgressReporter:
             except Exception:
                 pass  # Don't let callback errors break the flow
     
+    def abort_scan(self):
+        """Give up on a scan that won't reach finish_scan, restoring Ctrl+C handling."""
+        self._restore_interrupt_handler()
+    
+    def _install_interrupt_handler(self):
+        """Turn Ctrl+C into a cancel flag for the duration of a scan."""
+        # Signal handlers can only be set from the main thread
+        if self._sigint_installed or threading.current_thread() is not threading.main_thread():
+            return
+        
+        try:
+            previous = signal.signal(signal.SIGINT, self._handle_interrupt)
+        except (ValueError, OSError):
+            return
+        
+        self._previous_sigint = previous if previous is not None else signal.default_int_handler
+        self._sigint_installed = True
+    
+    def _restore_interrupt_handler(self):
+        """Put back the SIGINT handler that was active before the scan."""
+        if not self._sigint_installed:
+            return
+        
+        self._sigint_installed = False
+        try:
+            signal.signal(signal.SIGINT, self._previous_sigint)
+        except (ValueError, OSError):
+            pass
+    
+    def _handle_interrupt(self, signum, frame):
+        """Flag cancellation; a second Ctrl+C interrupts immediately."""
+        if self.cancelled:
+            self._restore_interrupt_handler()
+            raise KeyboardInterrupt
+        self.cancelled = True
+    
     def add_callback(self, callback: Callable):
         """Add a callback to be called when scan finishes."""
         self.callbacks.append(callback)
@@ -210,4 +296,4 @@ class ProgressReporter:
     
     def get_elapsed_time(self) -> float:
         """Get elapsed time since scan started."""
-        return time.time() - self.state.start_time
\ No newline at end of file
+        return time.monotonic() - self.state.start_time
\ No newline at end of file
@@ -3,15 +3,271 @@ GitHub MCP (Model Context Protocol) client for Iterate.
 Provides direct access to GitHub's API with zero-config authentication.
 """
 
-import os
+import hashlib
 import json
+import os
+import re
 import subprocess
-from typing import Dict, List, Optional, Any
+import threading
+import time
+from collections import OrderedDict
+from itertools import islice
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from pathlib import Path
+from urllib.parse import urlencode
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Decode API payloads with orjson when installed, falling back to the stdlib
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _json_loads = orjson.loads
+except ImportError:
+    ORJSON_AVAILABLE = False
+    _json_loads = json.loads
+
+# GitHub REST and GraphQL endpoints
+API_URL = "https://api.github.com"
+GRAPHQL_URL = f"{API_URL}/graphql"
+
+# Seconds a GitHub CLI token lookup is reused by newly created clients
+_AUTH_CACHE_TTL = 300.0
+
+# Field extractors for label and assignee nodes
+_LABEL_NAME = itemgetter("name")
+_ASSIGNEE_LOGIN = itemgetter("login")
+
+# Records per page when walking paginated REST listings (GitHub's maximum)
+_PAGE_SIZE = 100
+
+# GET responses kept for conditional requests, least recently used evicted first
+_RESPONSE_CACHE_SIZE = 128
+
+# Seconds a response persisted on disk is served without asking GitHub again
+DEFAULT_CACHE_TTL = 600.0
+
+# Mutations sent per GraphQL request, to stay within GitHub's secondary rate limits
+_MUTATION_BATCH_SIZE = 20
+
+# Freshness lifetime in a Cache-Control header
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+# Owner and name of a GitHub remote, from either the SSH or HTTPS form
+_REMOTE_RE = re.compile(r'github\.com[:/]([^/]+)/([^/]+?)(?:\.git)?/?$')
+
+# Node ID of the repository, which mutations take instead of owner/name
+_REPOSITORY_ID_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) { id }
+}
+"""
+
+# Selections shared by the queries below
+_REPOSITORY_FRAGMENT = """
+fragment RepositoryFields on Repository {
+  name nameWithOwner description url stargazerCount forkCount
+  primaryLanguage { name }
+}
+"""
+
+_ISSUE_FRAGMENT = """
+fragment IssueFields on Issue {
+  number title body state createdAt url
+  labels(first: 20) { nodes { name } }
+  assignees(first: 20) { nodes { login } }
+}
+"""
+
+_PULL_REQUEST_FRAGMENT = """
+fragment PullRequestFields on PullRequest {
+  number title body state createdAt url additions deletions
+  labels(first: 20) { nodes { name } }
+  assignees(first: 20) { nodes { login } }
+}
+"""
+
+# Repository details and open issue/PR counts in one round-trip
+_REPOSITORY_QUERY = """
+query($owner: String!, $name: String!) {
+  repository(owner: $owner, name: $name) {
+    ...RepositoryFields
+    issues(states: OPEN) { totalCount }
+    pullRequests(states: OPEN) { totalCount }
+  }
+}
+""" + _REPOSITORY_FRAGMENT
+
+# One cursor-paginated page of open issues, newest first
+_ISSUES_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    issues(first: $first, after: $after, states: OPEN, orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { ...IssueFields }
+    }
+  }
+}
+""" + _ISSUE_FRAGMENT
+
+# One cursor-paginated page of open pull requests, newest first
+_PULL_REQUESTS_QUERY = """
+query($owner: String!, $name: String!, $first: Int!, $after: String) {
+  repository(owner: $owner, name: $name) {
+    pullRequests(first: $first, after: $after, states: OPEN, orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { ...PullRequestFields }
+    }
+  }
+}
+""" + _PULL_REQUEST_FRAGMENT
+
+# Repository details, languages, open issues and PRs and recent default
+# branch commits as sibling fields of one query; the connections double as
+# the open counts. Contributor commit counts aren't exposed over GraphQL.
+_ANALYTICS_QUERY = """
+query($owner: String!, $name: String!, $issues: Int!, $pullRequests: Int!, $commits: Int!, $since: GitTimestamp!) {
+  repository(owner: $owner, name: $name) {
+    ...RepositoryFields
+    languages(first: 20, orderBy: {field: SIZE, direction: DESC}) {
+      edges { size node { name } }
+    }
+    issues(first: $issues, states: OPEN, orderBy: {field: CREATED_AT, direction: DESC}) {
+      totalCount
+      nodes { ...IssueFields }
+    }
+    pullRequests(first: $pullRequests, states: OPEN, orderBy: {field: CREATED_AT, direction: DESC}) {
+      totalCount
+      nodes { ...PullRequestFields }
+    }
+    defaultBranchRef {
+      target {
+        ... on Commit {
+          history(first: $commits, since: $since) {
+            nodes {
+              oid url message committedDate
+              author { name email date user { login } }
+            }
+          }
+        }
+      }
+    }
+  }
+}
+""" + _REPOSITORY_FRAGMENT + _ISSUE_FRAGMENT + _PULL_REQUEST_FRAGMENT
+
+
+def _run_command(cmd: List[str], timeout: int = 10) -> Optional[str]:
+    """
+    Run a command and return its stripped stdout, or None if it failed.
+    
+    Raises FileNotFoundError or subprocess.TimeoutExpired when the tool is
+    missing or hangs, so callers can tell those apart from a plain failure.
+    """
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+class _AuthCache:
+    """Outcome of the last `gh auth token` lookup, shared by all clients."""
+    token: Optional[str] = None
+    problem: Optional[str] = None
+    expires: float = 0.0
+    lock = threading.Lock()
 
 
-@dataclass
+def _gh_cli_token() -> Tuple[Optional[str], Optional[str]]:
+    """
+    Get the GitHub CLI's token, or None and a message saying why not.
+    
+    The lookup spawns gh, so its outcome is cached for _AUTH_CACHE_TTL
+    seconds; concurrent callers wait for a single lookup.
+    """
+    with _AuthCache.lock:
+        now = time.monotonic()
+        if now < _AuthCache.expires:
+            return _AuthCache.token, _AuthCache.problem
+        
+        try:
+            token = _run_command(["gh", "auth", "token"])
+            problem = None if token else "⚠️  GitHub MCP: GitHub CLI not authenticated"
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            token, problem = None, "❌ GitHub MCP: GitHub CLI not found or not working"
+        
+        _AuthCache.token, _AuthCache.problem = token, problem
+        _AuthCache.expires = now + _AUTH_CACHE_TTL
+        return token, problem
+
+
+class GitHubResponseCache:
+    """
+    GitHub API responses persisted on disk, so repeat runs can skip the network.
+    
+    Each entry is one JSON file holding the body, its ETag (if any) and the
+    wall-clock time it was fetched. Entries younger than `ttl` are served as
+    is; older ones are only useful for revalidating with If-None-Match.
+    """
+    
+    def __init__(self, cache_dir: str, ttl: float = DEFAULT_CACHE_TTL):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.enabled = True
+        
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            print(f"⚠️  GitHub MCP: Response cache disabled: {e}")
+            self.enabled = False
+    
+    def _get_cache_file(self, key: str) -> Path:
+        """Get the cache file path for a given key."""
+        return self.cache_dir / f"{hashlib.md5(key.encode()).hexdigest()}.json"
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Get the stored entry for a key, or None if there is no readable one."""
+        if not self.enabled:
+            return None
+        
+        try:
+            with open(self._get_cache_file(key), 'rb') as f:
+                entry = _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+        
+        return entry if isinstance(entry, dict) and "fetched_at" in entry else None
+    
+    def is_fresh(self, entry: Dict[str, Any]) -> bool:
+        """Check whether an entry is recent enough to use without revalidating."""
+        return time.time() - entry["fetched_at"] < self.ttl
+    
+    def put(self, key: str, etag: Optional[str], body: Any):
+        """Store a response body, stamped with the current time."""
+        if not self.enabled:
+            return
+        
+        cache_file = self._get_cache_file(key)
+        temp_file = cache_file.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with open(temp_file, 'w') as f:
+                json.dump({"etag": etag, "body": body, "fetched_at": time.time()}, f)
+            # Readers in other threads or runs never see a half-written entry
+            os.replace(temp_file, cache_file)
+        except (OSError, TypeError, ValueError):
+            try:
+                temp_file.unlink()
+            except OSError:
+                pass
+
+
+@dataclass(slots=True, frozen=True)
 class GitHubRepository:
     """GitHub repository information."""
     name: str
@@ -25,15 +281,15 @@ class GitHubRepository:
     url: str
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class GitHubIssue:
     """GitHub issue information."""
     number: int
     title: str
     body: str
     state: str
-    labels: List[str]
-    assignees: List[str]
+    labels: Tuple[str, ...]
+    assignees: Tuple[str, ...]
     created_at: str
     url: str
 
@@ -41,115 +297,414 @@ class GitHubIssue:
 class GitHubMCPClient:
     """GitHub MCP client for direct API access."""
     
-    def __init__(self):
+    def __init__(self, cache_dir: Optional[str] = None, cache_ttl: float = DEFAULT_CACHE_TTL):
         self.authenticated = False
         self.repository = None
+        self._session: Optional[requests.Session] = None
+        self._repo_slug: Optional[Tuple[str, str]] = None
+        self._repository_id: Optional[str] = None
+        
+        # GET responses by URL as (etag, body, fresh until), for If-None-Match
+        self._etag_cache: "OrderedDict[str, Tuple[str, Any, float]]" = OrderedDict()
+        self._etag_lock = threading.Lock()
+        
+        # Responses kept across runs, when a cache directory is given
+        self._response_cache = GitHubResponseCache(cache_dir, cache_ttl) if cache_dir else None
+        
         self._check_authentication()
     
     def _check_authentication(self) -> bool:
-        """Check if GitHub CLI is authenticated."""
-        try:
-            result = subprocess.run(
-                ["gh", "auth", "status"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0 and "Logged in" in result.stdout:
-                self.authenticated = True
-                print("✅ GitHub MCP: Using GitHub CLI authentication")
-                return True
-            else:
-                print("⚠️  GitHub MCP: GitHub CLI not authenticated")
+        """Find a GitHub token and open an API session with it."""
+        token = os.environ.get("GH_TOKEN") or os.environ.get("GITHUB_TOKEN")
+        source = "environment token"
+        
+        if not token:
+            # Reuse the GitHub CLI login; this is the only gh call we make
+            token, problem = _gh_cli_token()
+            if not token:
+                print(problem)
                 return False
-                
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            print("❌ GitHub MCP: GitHub CLI not found or not working")
-            return False
+            
+            source = "GitHub CLI authentication"
+        
+        self._session = self._create_session(token)
+        self.authenticated = True
+        print(f"✅ GitHub MCP: Using {source}")
+        return True
+    
+    @staticmethod
+    def _create_session(token: str) -> requests.Session:
+        """Create a keep-alive API session that retries transient failures."""
+        session = requests.Session()
+        session.headers.update({
+            "Authorization": f"Bearer {token}",
+            "Accept": "application/vnd.github+json"
+        })
+        
+        # Only idempotent methods are retried, so issues and comments aren't duplicated
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retry)
+        session.mount("https://", adapter)
+        return session
+    
+    def _get_repository_slug(self) -> Optional[Tuple[str, str]]:
+        """Get (owner, name) of the current directory's GitHub repository."""
+        if self._repo_slug is not None:
+            return self._repo_slug
+        
+        # GH_REPO overrides the remote, as it does for gh itself
+        remote = os.environ.get("GH_REPO", "")
+        if not remote:
+            try:
+                remote = _run_command(["git", "remote", "get-url", "origin"], timeout=5)
+            except (subprocess.TimeoutExpired, FileNotFoundError):
+                return None
+            if not remote:
+                return None
+        
+        match = _REMOTE_RE.search(remote)
+        if match:
+            self._repo_slug = (match.group(1), match.group(2))
+        elif remote.count("/") == 1:
+            owner, name = remote.split("/")
+            self._repo_slug = (owner, name)
+        else:
+            print(f"⚠️  Could not determine GitHub repository from: {remote}")
+        
+        return self._repo_slug
     
-    def _run_mcp_command(self, command: str, args: List[str] = None) -> Optional[Dict[str, Any]]:
-        """Run a GitHub MCP command."""
+    def _target_repository(self) -> Optional[Tuple[str, str]]:
+        """Get the (owner, name) to call the API for, or None if we can't."""
         if not self.authenticated:
             print("❌ Not authenticated with GitHub")
             return None
+        return self._get_repository_slug()
+    
+    def _request(self, method: str, path: str, timeout: int = 10, **kwargs) -> Optional[Any]:
+        """Call a repository REST endpoint and return the decoded JSON body."""
+        slug = self._target_repository()
+        if slug is None:
+            return None
         
-        try:
-            cmd = ["gh", command] + (args or [])
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+        url = f"{API_URL}/repos/{slug[0]}/{slug[1]}{path}"
+        
+        # GETs are answered from cache while fresh, then revalidated by ETag;
+        # a 304 costs no rate limit
+        cache_key = None
+        cached = None
+        headers = {}
+        if method == "GET":
+            cache_key = f"{url}?{urlencode(sorted((kwargs.get('params') or {}).items()))}"
+            cached = self._get_cached_response(cache_key) or self._load_persisted_response(cache_key)
+            if cached:
+                etag, body, fresh_until = cached
+                if time.monotonic() < fresh_until:
+                    return body
+                headers["If-None-Match"] = etag
+        
+        response = self._session.request(method, url, timeout=timeout, headers=headers, **kwargs)
+        
+        if response.status_code == 304 and cached:
+            self._store_response(cache_key, cached[0], cached[1], response)
+            return cached[1]
+        
+        if response.status_code >= 400:
+            print(f"❌ GitHub API request failed: {response.status_code} {response.reason}")
+            return None
+        
+        body = _json_loads(response.content)
+        etag = response.headers.get("ETag")
+        if cache_key and etag:
+            self._store_response(cache_key, etag, body, response)
+        return body
+    
+    def _get_cached_response(self, cache_key: str) -> Optional[Tuple[str, Any, float]]:
+        """Look up a cached GET response, marking it recently used."""
+        with self._etag_lock:
+            cached = self._etag_cache.get(cache_key)
+            if cached:
+                self._etag_cache.move_to_end(cache_key)
+            return cached
+    
+    def _load_persisted_response(self, cache_key: str) -> Optional[Tuple[str, Any, float]]:
+        """Look up a GET response saved by an earlier run, as an in-memory cache entry."""
+        if self._response_cache is None:
+            return None
+        
+        entry = self._response_cache.get(cache_key)
+        if not entry or not entry.get("etag"):
+            return None
+        
+        # Carry the entry's remaining disk lifetime over to the monotonic clock
+        remaining = entry["fetched_at"] + self._response_cache.ttl - time.time()
+        return entry["etag"], entry["body"], time.monotonic() + remaining
+    
+    def _store_response(self, cache_key: str, etag: str, body: Any, response: requests.Response):
+        """Cache a GET response body with its ETag and Cache-Control lifetime."""
+        match = _MAX_AGE_RE.search(response.headers.get("Cache-Control", ""))
+        fresh_until = time.monotonic() + (int(match.group(1)) if match else 0)
+        
+        if self._response_cache is not None:
+            self._response_cache.put(cache_key, etag, body)
+        
+        with self._etag_lock:
+            self._etag_cache[cache_key] = (etag, body, fresh_until)
+            self._etag_cache.move_to_end(cache_key)
+            while len(self._etag_cache) > _RESPONSE_CACHE_SIZE:
+                self._etag_cache.popitem(last=False)
+    
+    def _iter_pages(self, path: str, params: Optional[Dict[str, Any]] = None) -> Iterator[Any]:
+        """
+        Yield records from a paginated REST listing, one page in memory at a time.
+        
+        Pages are fetched lazily, so a consumer that stops early never
+        requests the rest; each page is cached and revalidated like any GET.
+        """
+        page = 1
+        while True:
+            records = self._request("GET", path, params={**(params or {}), "per_page": _PAGE_SIZE, "page": page})
+            if not records:
+                return
             
-            if result.returncode == 0:
-                try:
-                    return json.loads(result.stdout)
-                except json.JSONDecodeError:
-                    return {"raw_output": result.stdout.strip()}
-            else:
-                print(f"❌ MCP command failed: {result.stderr}")
-                return None
-                
-        except subprocess.TimeoutExpired:
-            print("❌ MCP command timed out")
+            yield from records
+            
+            if len(records) < _PAGE_SIZE:
+                return
+            page += 1
+    
+    def _graphql(self, query: str, variables: Optional[Dict[str, Any]] = None,
+                 timeout: int = 10) -> Optional[Dict[str, Any]]:
+        """Run a GraphQL query against the current repository and return its data."""
+        slug = self._target_repository()
+        if slug is None:
             return None
-        except Exception as e:
-            print(f"❌ MCP command error: {e}")
+        
+        variables = {"owner": slug[0], "name": slug[1], **(variables or {})}
+        
+        # GraphQL has no ETags, so persisted results are reused for their TTL only
+        cache_key = None
+        if self._response_cache is not None:
+            cache_key = f"{GRAPHQL_URL}?{json.dumps(variables, sort_keys=True)}\n{query}"
+            entry = self._response_cache.get(cache_key)
+            if entry and self._response_cache.is_fresh(entry):
+                return entry["body"]
+        
+        payload = self._post_graphql(query, variables, timeout)
+        if payload is None:
+            return None
+        
+        if payload.get("errors"):
+            print(f"❌ GitHub GraphQL query failed: {payload['errors'][0].get('message')}")
+            return None
+        
+        data = payload.get("data")
+        if cache_key:
+            self._response_cache.put(cache_key, None, data)
+        return data
+    
+    def _post_graphql(self, query: str, variables: Dict[str, Any], timeout: int) -> Optional[Dict[str, Any]]:
+        """Send a GraphQL document as is and return the decoded payload, or None on HTTP failure."""
+        response = self._session.post(
+            GRAPHQL_URL,
+            json={"query": query, "variables": variables},
+            timeout=timeout
+        )
+        
+        if response.status_code >= 400:
+            print(f"❌ GitHub GraphQL request failed: {response.status_code} {response.reason}")
             return None
+        
+        return _json_loads(response.content)
+    
+    def _mutate(self, declarations: List[str], fields: List[str], variables: Dict[str, Any],
+                timeout: int = 30) -> Dict[str, Any]:
+        """
+        Run aliased mutations in one request and return the data by alias.
+        
+        Each mutation succeeds or fails on its own; failed ones are missing
+        or None in the result. Mutations are never cached.
+        """
+        document = f"mutation({', '.join(declarations)}) {{\n  " + "\n  ".join(fields) + "\n}"
+        payload = self._post_graphql(document, variables, timeout)
+        if payload is None:
+            return {}
+        
+        if payload.get("errors"):
+            print(f"❌ GitHub GraphQL mutation failed: {payload['errors'][0].get('message')}")
+        
+        return payload.get("data") or {}
+    
+    def _get_repository_id(self) -> Optional[str]:
+        """Get the GraphQL node ID of the current repository."""
+        if self._repository_id is None:
+            data = self._graphql(_REPOSITORY_ID_QUERY)
+            repository = data.get("repository") if data else None
+            if repository:
+                self._repository_id = repository["id"]
+        return self._repository_id
+    
+    def _get_pull_request_ids(self, numbers: List[int]) -> Dict[int, str]:
+        """Get the GraphQL node IDs of pull requests by number, in one query."""
+        declarations = ["$owner: String!", "$name: String!"]
+        fields = []
+        variables = {}
+        for i, number in enumerate(numbers):
+            declarations.append(f"$number{i}: Int!")
+            fields.append(f"pr{i}: pullRequest(number: $number{i}) {{ id }}")
+            variables[f"number{i}"] = number
+        
+        query = (f"query({', '.join(declarations)}) {{\n  repository(owner: $owner, name: $name) {{\n    "
+                 + "\n    ".join(fields) + "\n  }\n}")
+        data = self._graphql(query, variables)
+        repository = data.get("repository") if data else None
+        if not repository:
+            return {}
+        
+        return {
+            number: repository[f"pr{i}"]["id"]
+            for i, number in enumerate(numbers)
+            if repository.get(f"pr{i}")
+        }
+    
+    def _iter_connection(self, query: str, connection: str,
+                         limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield nodes of a repository connection, following cursors, up to `limit` if given.
+        
+        The query must take $first and $after and select pageInfo; pages are
+        requested lazily, at most _PAGE_SIZE nodes at a time.
+        """
+        cursor = None
+        remaining = limit
+        while remaining is None or remaining > 0:
+            first = _PAGE_SIZE if remaining is None else min(_PAGE_SIZE, remaining)
+            data = self._graphql(query, {"first": first, "after": cursor})
+            repository = data.get("repository") if data else None
+            if not repository:
+                return
+            
+            page = repository[connection]
+            nodes = page["nodes"]
+            if remaining is None:
+                yield from nodes
+            else:
+                yield from nodes[:remaining]
+                remaining -= len(nodes)
+            
+            if not page["pageInfo"]["hasNextPage"]:
+                return
+            cursor = page["pageInfo"]["endCursor"]
+    
+    @staticmethod
+    def _repository_from_node(repository: Dict[str, Any]) -> GitHubRepository:
+        """Build a GitHubRepository from RepositoryFields plus issue/PR totalCounts."""
+        primary_language = repository.get("primaryLanguage")
+        return GitHubRepository(
+            name=repository.get("name", ""),
+            full_name=repository.get("nameWithOwner", ""),
+            description=repository.get("description"),
+            language=primary_language.get("name") if primary_language else None,
+            stars=repository.get("stargazerCount", 0),
+            forks=repository.get("forkCount", 0),
+            issues=repository["issues"]["totalCount"],
+            pull_requests=repository["pullRequests"]["totalCount"],
+            url=repository.get("url", "")
+        )
+    
+    @staticmethod
+    def _issue_from_node(issue: Dict[str, Any]) -> GitHubIssue:
+        """Build a GitHubIssue from IssueFields."""
+        return GitHubIssue(
+            number=issue["number"],
+            title=issue["title"],
+            body=issue["body"] or "",
+            # GraphQL states are upper case; keep the REST spelling callers compare against
+            state=issue["state"].lower(),
+            labels=tuple(map(_LABEL_NAME, issue["labels"]["nodes"])),
+            assignees=tuple(map(_ASSIGNEE_LOGIN, issue["assignees"]["nodes"])),
+            created_at=issue["createdAt"],
+            url=issue["url"]
+        )
+    
+    @staticmethod
+    def _pull_request_from_node(pr: Dict[str, Any]) -> Dict[str, Any]:
+        """Flatten PullRequestFields' label and assignee connections to lists."""
+        return {
+            **pr,
+            "labels": pr["labels"]["nodes"],
+            "assignees": pr["assignees"]["nodes"]
+        }
+    
+    @staticmethod
+    def _commit_from_node(commit: Dict[str, Any]) -> Dict[str, Any]:
+        """Reshape a GraphQL commit node like an entry of the REST commit list."""
+        author = commit.get("author") or {}
+        user = author.get("user")
+        return {
+            "sha": commit["oid"],
+            "html_url": commit["url"],
+            "commit": {
+                "message": commit["message"],
+                "author": {"name": author.get("name"), "email": author.get("email"), "date": author.get("date")},
+                "committer": {"date": commit["committedDate"]}
+            },
+            "author": {"login": user["login"]} if user else None
+        }
+    
+    @staticmethod
+    def _repository_from_rest(repository: Dict[str, Any], open_pull_requests: int) -> GitHubRepository:
+        """Build a GitHubRepository from the REST repository resource."""
+        return GitHubRepository(
+            name=repository.get("name", ""),
+            full_name=repository.get("full_name", ""),
+            description=repository.get("description"),
+            language=repository.get("language"),
+            stars=repository.get("stargazers_count", 0),
+            forks=repository.get("forks_count", 0),
+            # REST counts open pull requests as issues too
+            issues=repository.get("open_issues_count", 0) - open_pull_requests,
+            pull_requests=open_pull_requests,
+            url=repository.get("html_url", "")
+        )
+    
+    @staticmethod
+    def _issue_from_rest(issue: Dict[str, Any]) -> GitHubIssue:
+        """Build a GitHubIssue from an entry of the REST issue list."""
+        return GitHubIssue(
+            number=issue["number"],
+            title=issue["title"],
+            body=issue["body"] or "",
+            state=issue["state"],
+            labels=tuple(map(_LABEL_NAME, issue["labels"])),
+            assignees=tuple(map(_ASSIGNEE_LOGIN, issue["assignees"])),
+            created_at=issue["created_at"],
+            url=issue["html_url"]
+        )
+    
+    @staticmethod
+    def _pull_request_from_rest(pr: Dict[str, Any]) -> Dict[str, Any]:
+        """Reshape a REST pull request resource like _pull_request_from_node's result."""
+        return {
+            "number": pr["number"],
+            "title": pr["title"],
+            "body": pr["body"] or "",
+            "state": pr["state"].upper(),
+            "createdAt": pr["created_at"],
+            "url": pr["html_url"],
+            "additions": pr.get("additions", 0),
+            "deletions": pr.get("deletions", 0),
+            "labels": [{"name": label["name"]} for label in pr["labels"]],
+            "assignees": [{"login": assignee["login"]} for assignee in pr["assignees"]]
+        }
     
     def get_current_repository(self) -> Optional[GitHubRepository]:
         """Get current repository information."""
         try:
-            # Get repo info using gh repo view
-            result = subprocess.run(
-                ["gh", "repo", "view", "--json", "name,fullName,description,primaryLanguage,stargazerCount,forkCount,issues,openIssues,openPullRequests,url"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            data = self._graphql(_REPOSITORY_QUERY)
+            repository = data.get("repository") if data else None
             
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                
-                # Get issues count
-                issues_result = subprocess.run(
-                    ["gh", "issue", "list", "--json", "number"],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                issues_count = 0
-                if issues_result.returncode == 0:
-                    issues_data = json.loads(issues_result.stdout)
-                    issues_count = len(issues_data)
-                
-                # Get PR count
-                pr_result = subprocess.run(
-                    ["gh", "pr", "list", "--json", "number"],
-                    capture_output=True,
-                    text=True,
-                    timeout=10
-                )
-                
-                pr_count = 0
-                if pr_result.returncode == 0:
-                    pr_data = json.loads(pr_result.stdout)
-                    pr_count = len(pr_data)
-                
-                return GitHubRepository(
-                    name=data.get("name", ""),
-                    full_name=data.get("fullName", ""),
-                    description=data.get("description"),
-                    language=data.get("primaryLanguage", {}).get("name") if data.get("primaryLanguage") else None,
-                    stars=data.get("stargazerCount", 0),
-                    forks=data.get("forkCount", 0),
-                    issues=issues_count,
-                    pull_requests=pr_count,
-                    url=data.get("url", "")
-                )
+            if repository:
+                return self._repository_from_node(repository)
             
             return None
             
@@ -160,18 +715,7 @@ class GitHubMCPClient:
     def get_repository_languages(self) -> Dict[str, int]:
         """Get repository language statistics."""
         try:
-            result = subprocess.run(
-                ["gh", "repo", "view", "--json", "languages"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                return data.get("languages", {})
-            
-            return {}
+            return self._request("GET", "/languages") or {}
             
         except Exception as e:
             print(f"❌ Failed to get language stats: {e}")
@@ -180,49 +724,20 @@ class GitHubMCPClient:
     def get_contributors(self) -> List[Dict[str, Any]]:
         """Get repository contributors."""
         try:
-            result = subprocess.run(
-                ["gh", "api", "repos/:owner/:repo/contributors"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            
-            return []
+            return self._request("GET", "/contributors") or []
             
         except Exception as e:
             print(f"❌ Failed to get contributors: {e}")
             return []
     
-    def get_issues(self) -> List[GitHubIssue]:
-        """Get repository issues."""
+    def iter_issues(self, max_issues: Optional[int] = None) -> Iterator[GitHubIssue]:
+        """Lazily yield open repository issues, newest first, fetching pages on demand."""
+        return map(self._issue_from_node, self._iter_connection(_ISSUES_QUERY, "issues", max_issues))
+    
+    def get_issues(self, max_issues: int = _PAGE_SIZE) -> List[GitHubIssue]:
+        """Get open repository issues, newest first, up to max_issues."""
         try:
-            result = subprocess.run(
-                ["gh", "issue", "list", "--json", "number,title,body,state,labels,assignees,createdAt,url"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                data = json.loads(result.stdout)
-                return [
-                    GitHubIssue(
-                        number=issue["number"],
-                        title=issue["title"],
-                        body=issue["body"] or "",
-                        state=issue["state"],
-                        labels=[label["name"] for label in issue.get("labels", [])],
-                        assignees=[assignee["login"] for assignee in issue.get("assignees", [])],
-                        created_at=issue["createdAt"],
-                        url=issue["url"]
-                    )
-                    for issue in data
-                ]
-            
-            return []
+            return list(self.iter_issues(max_issues))
             
         except Exception as e:
             print(f"❌ Failed to get issues: {e}")
@@ -231,96 +746,104 @@ class GitHubMCPClient:
     def create_issue(self, title: str, body: str, labels: List[str] = None) -> Optional[int]:
         """Create a new GitHub issue."""
         try:
-            cmd = ["gh", "issue", "create", "--title", title, "--body", body]
-            
+            payload = {"title": title, "body": body}
             if labels:
-                for label in labels:
-                    cmd.extend(["--label", label])
+                payload["labels"] = labels
             
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            data = self._request("POST", "/issues", timeout=30, json=payload)
             
-            if result.returncode == 0:
-                # Extract issue number from output
-                output = result.stdout.strip()
-                if "Created issue" in output:
-                    # Parse issue number from output like "Created issue #123"
-                    try:
-                        issue_number = int(output.split("#")[-1].split()[0])
-                        return issue_number
-                    except (ValueError, IndexError):
-                        print("⚠️  Issue created but couldn't parse issue number")
-                        return None
-                elif "https://github.com" in output:
-                    # Parse issue number from URL like "https://github.com/owner/repo/issues/123"
-                    try:
-                        issue_number = int(output.split("/")[-1])
-                        return issue_number
-                    except (ValueError, IndexError):
-                        print("⚠️  Issue created but couldn't parse issue number from URL")
-                        return None
-                else:
-                    print(f"⚠️  Unexpected output: {output}")
-                    return None
-            else:
-                print(f"❌ Failed to create issue: {result.stderr}")
-                return None
+            if data:
+                return data.get("number")
+            
+            print("❌ Failed to create issue")
+            return None
                 
         except Exception as e:
             print(f"❌ Error creating issue: {e}")
             return None
     
-    def is_git_repository(self, directory: str = ".") -> bool:
-        """Check if directory is a Git repository."""
+    def create_issues(self, issues: List[Tuple[str, str]]) -> List[Optional[int]]:
+        """
+        Create several (title, body) issues with batched createIssue mutations.
+        
+        Up to _MUTATION_BATCH_SIZE issues go in each request. Returns the new
+        issue numbers in order, with None for any that failed.
+        """
+        numbers: List[Optional[int]] = [None] * len(issues)
+        if not issues:
+            return numbers
+        
         try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--git-dir"],
-                cwd=directory,
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            return result.returncode == 0
-        except Exception:
+            repository_id = self._get_repository_id()
+            if repository_id is None:
+                print("❌ Failed to create issues: repository not found")
+                return numbers
+            
+            for start in range(0, len(issues), _MUTATION_BATCH_SIZE):
+                batch = range(start, min(start + _MUTATION_BATCH_SIZE, len(issues)))
+                declarations = ["$repositoryId: ID!"]
+                fields = []
+                variables = {"repositoryId": repository_id}
+                for i in batch:
+                    declarations.append(f"$title{i}: String!, $body{i}: String")
+                    fields.append(
+                        f"issue{i}: createIssue(input: {{repositoryId: $repositoryId, title: $title{i}, body: $body{i}}}) "
+                        "{ issue { number } }"
+                    )
+                    variables[f"title{i}"], variables[f"body{i}"] = issues[i]
+                
+                data = self._mutate(declarations, fields, variables)
+                for i in batch:
+                    result = data.get(f"issue{i}")
+                    if result and result.get("issue"):
+                        numbers[i] = result["issue"]["number"]
+            
+        except Exception as e:
+            print(f"❌ Error creating issues: {e}")
+        
+        return numbers
+    
+    def is_git_repository(self, directory: str = ".") -> bool:
+        """Check if directory is inside a Git repository."""
+        if not os.path.isdir(directory):
             return False
+        
+        # Look for .git in the directory or any parent, as git itself does;
+        # it is a directory in clones and a file in worktrees and submodules
+        current = os.path.abspath(directory)
+        while True:
+            if os.path.exists(os.path.join(current, ".git")):
+                return True
+            parent = os.path.dirname(current)
+            if parent == current:
+                return False
+            current = parent
     
-    def get_commit_history(self, days: int = 30) -> List[Dict[str, Any]]:
-        """Get recent commit history."""
+    def iter_commit_history(self, days: int = 30) -> Iterator[Dict[str, Any]]:
+        """Stream commits from the last `days` days, newest first, page by page."""
+        # Whole hours, so the request (and its cache key) is stable between runs
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:00:00Z")
+        return self._iter_pages("/commits", {"since": since})
+    
+    def get_commit_history(self, days: int = 30, max_commits: int = _PAGE_SIZE) -> List[Dict[str, Any]]:
+        """Get recent commit history, up to max_commits commits."""
         try:
-            result = subprocess.run(
-                ["gh", "api", f"repos/:owner/:repo/commits?since={days}days"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            
-            return []
+            return list(islice(self.iter_commit_history(days), max_commits))
             
         except Exception as e:
             print(f"❌ Failed to get commit history: {e}")
             return []
     
-    def get_pull_requests(self) -> List[Dict[str, Any]]:
-        """Get repository pull requests."""
+    def iter_pull_requests(self, max_pull_requests: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Lazily yield open repository pull requests, newest first, fetching pages on demand."""
+        # The REST list omits additions/deletions, so use GraphQL
+        return map(self._pull_request_from_node,
+                   self._iter_connection(_PULL_REQUESTS_QUERY, "pullRequests", max_pull_requests))
+    
+    def get_pull_requests(self, max_pull_requests: int = _PAGE_SIZE) -> List[Dict[str, Any]]:
+        """Get open repository pull requests, newest first, up to max_pull_requests."""
         try:
-            result = subprocess.run(
-                ["gh", "pr", "list", "--json", "number,title,body,state,labels,assignees,createdAt,url,additions,deletions"],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode == 0:
-                return json.loads(result.stdout)
-            
-            return []
+            return list(self.iter_pull_requests(max_pull_requests))
             
         except Exception as e:
             print(f"❌ Failed to get pull requests: {e}")
@@ -329,28 +852,181 @@ class GitHubMCPClient:
     def comment_on_pr(self, pr_number: int, comment: str) -> bool:
         """Add a comment to a pull request."""
         try:
-            result = subprocess.run(
-                ["gh", "pr", "comment", str(pr_number), "--body", comment],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
-            
-            return result.returncode == 0
+            # Pull request conversation comments live on the issues endpoint
+            data = self._request("POST", f"/issues/{pr_number}/comments", timeout=30, json={"body": comment})
+            return data is not None
             
         except Exception as e:
             print(f"❌ Failed to comment on PR: {e}")
             return False
     
-    def get_repository_analytics(self) -> Dict[str, Any]:
-        """Get comprehensive repository analytics."""
-        analytics = {
-            "repository": self.get_current_repository(),
-            "languages": self.get_repository_languages(),
-            "contributors": self.get_contributors(),
-            "issues": self.get_issues(),
-            "pull_requests": self.get_pull_requests(),
-            "commit_history": self.get_commit_history()
+    def comment_on_prs(self, comments: List[Tuple[int, str]]) -> List[bool]:
+        """
+        Add several (PR number, comment) comments with batched addComment mutations.
+        
+        Each batch of up to _MUTATION_BATCH_SIZE costs one query for the pull
+        requests' node IDs and one mutation request. Returns whether each
+        comment was added, in order.
+        """
+        added = [False] * len(comments)
+        
+        try:
+            for start in range(0, len(comments), _MUTATION_BATCH_SIZE):
+                batch = range(start, min(start + _MUTATION_BATCH_SIZE, len(comments)))
+                subject_ids = self._get_pull_request_ids([comments[i][0] for i in batch])
+                
+                declarations = []
+                fields = []
+                variables = {}
+                for i in batch:
+                    pr_number, comment = comments[i]
+                    if pr_number not in subject_ids:
+                        print(f"❌ Failed to comment on PR: #{pr_number} not found")
+                        continue
+                    declarations.append(f"$subject{i}: ID!, $body{i}: String!")
+                    fields.append(f"comment{i}: addComment(input: {{subjectId: $subject{i}, body: $body{i}}}) {{ clientMutationId }}")
+                    variables[f"subject{i}"] = subject_ids[pr_number]
+                    variables[f"body{i}"] = comment
+                
+                if not fields:
+                    continue
+                
+                data = self._mutate(declarations, fields, variables)
+                for i in batch:
+                    added[i] = data.get(f"comment{i}") is not None
+            
+        except Exception as e:
+            print(f"❌ Failed to comment on PRs: {e}")
+        
+        return added
+    
+    def _get_current_repository_rest(self) -> Optional[GitHubRepository]:
+        """Get current repository information from REST only."""
+        try:
+            repository = self._request("GET", "")
+            if not repository:
+                return None
+            
+            # The repository resource has no open PR count, so count the
+            # list; its pages are the ones _get_pull_requests_rest reads
+            open_pull_requests = sum(1 for _ in self._iter_pages("/pulls", {"state": "open"}))
+            return self._repository_from_rest(repository, open_pull_requests)
+            
+        except Exception as e:
+            print(f"❌ Failed to get repository info: {e}")
+            return None
+    
+    def _get_issues_rest(self, max_issues: int = _PAGE_SIZE) -> List[GitHubIssue]:
+        """Get open repository issues, newest first, up to max_issues, from REST only."""
+        try:
+            # The REST issue list includes pull requests; skip them
+            issues = (
+                issue for issue in self._iter_pages("/issues", {"state": "open"})
+                if "pull_request" not in issue
+            )
+            return list(map(self._issue_from_rest, islice(issues, max_issues)))
+            
+        except Exception as e:
+            print(f"❌ Failed to get issues: {e}")
+            return []
+    
+    def _get_pull_requests_rest(self, max_pull_requests: int = _PAGE_SIZE,
+                                max_concurrency: int = 5) -> List[Dict[str, Any]]:
+        """Get open repository pull requests, newest first, up to max_pull_requests, from REST only."""
+        try:
+            numbers = [pr["number"] for pr in islice(self._iter_pages("/pulls", {"state": "open"}), max_pull_requests)]
+            if not numbers:
+                return []
+            
+            # The list omits additions/deletions, which only the single PR resource has
+            with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(numbers)))) as executor:
+                pull_requests = list(executor.map(lambda number: self._request("GET", f"/pulls/{number}"), numbers))
+            return [self._pull_request_from_rest(pr) for pr in pull_requests if pr]
+            
+        except Exception as e:
+            print(f"❌ Failed to get pull requests: {e}")
+            return []
+    
+    def get_repository_analytics(self, max_concurrency: int = 5, days: int = 30,
+                                 max_issues: int = _PAGE_SIZE, max_pull_requests: int = _PAGE_SIZE,
+                                 max_commits: int = _PAGE_SIZE) -> Dict[str, Any]:
+        """
+        Get comprehensive repository analytics.
+        
+        Only the most recent activity is fetched: up to max_issues open issues,
+        max_pull_requests open PRs and max_commits commits from the last
+        `days` days, which is one page each at the defaults.
+        
+        Everything is fetched over REST, so this still works when GraphQL is
+        unavailable or rate limited; pull requests cost one request each for
+        their additions and deletions.
+        
+        The getters are independent network calls, so they run concurrently
+        on at most max_concurrency threads to stay within GitHub's secondary
+        rate limits.
+        """
+        fetchers = {
+            "repository": self._get_current_repository_rest,
+            "languages": self.get_repository_languages,
+            "contributors": self.get_contributors,
+            "issues": lambda: self._get_issues_rest(max_issues),
+            "pull_requests": lambda: self._get_pull_requests_rest(max_pull_requests, max_concurrency),
+            "commit_history": lambda: self.get_commit_history(days, max_commits)
         }
         
-        return analytics 
\ No newline at end of file
+        # Resolve the repository once up front rather than racing in every thread
+        self._get_repository_slug()
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(max_concurrency, len(fetchers)))) as executor:
+            futures = {key: executor.submit(fetch) for key, fetch in fetchers.items()}
+            analytics = {key: future.result() for key, future in futures.items()}
+        
+        return analytics
+    
+    def get_repository_analytics_graphql(self, days: int = 30, max_issues: int = _PAGE_SIZE,
+                                         max_pull_requests: int = _PAGE_SIZE,
+                                         max_commits: int = _PAGE_SIZE) -> Dict[str, Any]:
+        """
+        Get the same analytics as get_repository_analytics from one GraphQL query.
+        
+        The query is a single page, so each cap is at most _PAGE_SIZE.
+        Contributors still come from REST, fetched alongside the query.
+        Returns an empty dict if the query fails, so callers can fall back
+        to get_repository_analytics.
+        """
+        # Whole hours, so the query (and its cache key) is stable between runs
+        since = (datetime.now(timezone.utc) - timedelta(days=days)).strftime("%Y-%m-%dT%H:00:00Z")
+        
+        # Resolve the repository once up front rather than racing in both threads
+        self._get_repository_slug()
+        
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                contributors = executor.submit(self.get_contributors)
+                data = self._graphql(_ANALYTICS_QUERY, {
+                    "issues": min(max_issues, _PAGE_SIZE),
+                    "pullRequests": min(max_pull_requests, _PAGE_SIZE),
+                    "commits": min(max_commits, _PAGE_SIZE),
+                    "since": since
+                }, timeout=30)
+                contributors = contributors.result()
+            
+            repository = data.get("repository") if data else None
+            if not repository:
+                return {}
+            
+            branch = repository.get("defaultBranchRef")
+            history = branch["target"].get("history") if branch and branch.get("target") else None
+            
+            return {
+                "repository": self._repository_from_node(repository),
+                "languages": {edge["node"]["name"]: edge["size"] for edge in repository["languages"]["edges"]},
+                "contributors": contributors,
+                "issues": list(map(self._issue_from_node, repository["issues"]["nodes"])),
+                "pull_requests": list(map(self._pull_request_from_node, repository["pullRequests"]["nodes"])),
+                "commit_history": list(map(self._commit_from_node, history["nodes"])) if history else []
+            }
+            
+        except Exception as e:
+            print(f"❌ Failed to get repository analytics: {e}")
+            return {}
@@ -3,19 +3,119 @@ Enhanced repository analyzer using GitHub MCP.
 Provides comprehensive code debt analysis with GitHub integration.
 """
 
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+import hashlib
+import heapq
+import io
+import os
+import pickle
+import subprocess
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+from string import Template
 from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Any, Tuple
+from dataclasses import asdict, dataclass, field
 
-from .mcp_client import GitHubMCPClient, GitHubRepository, GitHubIssue
+from .mcp_client import GitHubMCPClient, GitHubRepository, GitHubIssue, DEFAULT_CACHE_TTL
 from ..utils.dependency_analyzer import DependencyAnalyzer
 from ..core.error_handler import ErrorHandler
 from ..core.progress_reporter import ProgressReporter
-from ..core.advanced_metrics import AdvancedCodeAnalyzer
+from ..core.cache_manager import FileResultCache
+from ..core.dependency_mapper import FileDependencies
+from ..core.advanced_metrics import AdvancedCodeAnalyzer, ComplexityMetrics
 from ..core.code_generator import CodeGenerator
 
+# Pull request count above which PR debt ratios are computed as arrays
+_VECTORIZE_PR_THRESHOLD = 500
 
-@dataclass
+# Dependency map size above which per-file counts are tallied as arrays
+_VECTORIZE_DEPENDENCY_THRESHOLD = 1000
+
+# PR debt ratios above which a PR's debt is moderate or high
+_MODERATE_PR_DEBT = 0.7
+_HIGH_PR_DEBT = 0.8
+
+# Caches written by the analysis itself, left out of the working tree fingerprint
+_ANALYSIS_OUTPUT_EXCLUDES = (":(exclude,glob)**/.iterate_cache/**", ":(exclude,glob)**/.dependency_cache/**")
+
+
+def _user_cache_dir() -> Path:
+    """The per-user cache directory, outside any analyzed repository."""
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "iterate"
+
+
+# Bodies of the issues and comments posted for debt findings
+_DEBT_ISSUE_TEMPLATE = Template("""## Code Debt Analysis
+
+**Debt Score:** $debt_score
+
+### Findings:
+- $files files analyzed
+- $total_imports total imports
+- $total_exports total exports
+
+### Recommendations:
+$recommendations
+
+### Team Insights:
+- Contributors: $contributors
+- Recent commits: $recent_commits
+- Open issues: $open_issues
+
+---
+*Generated by Iterate Code Debt Tool with GitHub MCP*""")
+
+_PR_DEBT_ISSUE_TEMPLATE = Template("""## Pull Request Debt Analysis
+
+**PR:** #$number - $title
+**Debt Score:** $debt_score
+
+### Changes:
+- Additions: $additions
+- Deletions: $deletions
+- Total changes: $total_changes
+
+### Recommendation:
+This PR introduces significant new code. Consider:
+- Breaking down large changes into smaller PRs
+- Adding more tests for new functionality
+- Reviewing for potential code duplication
+
+---
+*Generated by Iterate Code Debt Tool with GitHub MCP*""")
+
+_PR_DEBT_COMMENT_TEMPLATE = Template("""## Code Debt Analysis
+
+This PR has a debt score of **$debt_score**.
+
+### Analysis:
+- Additions: $additions lines
+- Deletions: $deletions lines
+- Total changes: $total_changes lines
+
+### Recommendations:
+- Consider breaking down large changes
+- Add comprehensive tests
+- Review for code duplication
+- Consider pair programming for complex changes
+
+---
+*Generated by Iterate Code Debt Tool*""")
+
+
+def _file_extension(file_path: str) -> str:
+    """Lower-cased extension of a path, like os.path.splitext but with two rfinds."""
+    dot = file_path.rfind('.')
+    # A dot at the start of the name marks a hidden file, not an extension
+    if dot <= file_path.rfind(os.sep) + 1:
+        return ''
+    return file_path[dot:].lower()
+
+
+@dataclass(slots=True)
 class MCPRepositoryAnalysis:
     """Enhanced repository analysis with MCP data."""
     repository: Optional[GitHubRepository]
@@ -32,55 +132,154 @@ class MCPRepositoryAnalysis:
     team_insights: Dict[str, Any]
     refactoring_suggestions: List[Dict[str, Any]]
     quality_report: Dict[str, Any]
+    total_imports: int = 0
+    total_exports: int = 0
+    pr_debt_buckets: Dict[str, List[Dict[str, Any]]] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class DebtStats:
+    """Dependency tallies and debt score from a single walk over the dependency map."""
+    score: float = 0.0
+    total_imports: int = 0
+    total_exports: int = 0
+    high_dep_files: List[str] = field(default_factory=list)
+    no_dep_files: List[str] = field(default_factory=list)
 
 
 class MCPRepositoryAnalyzer:
     """Enhanced repository analyzer using GitHub MCP."""
     
-    def __init__(self, error_handler: Optional[ErrorHandler] = None):
-        self.mcp_client = GitHubMCPClient()
+    def __init__(self, error_handler: Optional[ErrorHandler] = None,
+                 use_cache: bool = True, cache_ttl: float = DEFAULT_CACHE_TTL,
+                 use_graphql: bool = True):
+        # GitHub responses are kept on disk for cache_ttl seconds so repeat
+        # analyses skip the network; stale ones are revalidated by ETag
+        self.mcp_client = GitHubMCPClient(
+            cache_dir=".iterate_cache/github" if use_cache else None,
+            cache_ttl=cache_ttl
+        )
+        
+        # Whether to try the single GraphQL query before the REST fan-out
+        self._use_graphql = use_graphql
+        
+        # Whole analyses of an unchanged working tree are reused for as long.
+        # They are pickled, so they live in the user's cache directory where a
+        # cloned repository can't plant one
+        self._analysis_cache_dir = _user_cache_dir() / "analysis" if use_cache else None
+        self._cache_ttl = cache_ttl
         self.error_handler = error_handler or ErrorHandler()
-        self.dependency_analyzer = DependencyAnalyzer(
-            directory=".",
-            error_handler=self.error_handler,
-            progress_reporter=ProgressReporter()
+        
+        # Per-file results keyed by mtime and size, so when the tree did change
+        # only the changed files are parsed again
+        self._file_cache_dir = Path(".iterate_cache/files") if use_cache else None
+        
+        # Built on first use, for the directory passed to analyze_repository,
+        # so callers that only post issues or comments never pay for it
+        self._directory = "."
+        self._dependency_analyzer: Optional[DependencyAnalyzer] = None
+        
+        self.advanced_analyzer = AdvancedCodeAnalyzer(
+            complexity_cache=self._file_cache(
+                "complexity", asdict, lambda data: ComplexityMetrics(**data)
+            ),
+            function_cache=self._file_cache("functions")
         )
-        self.advanced_analyzer = AdvancedCodeAnalyzer()
         self.code_generator = CodeGenerator()
+        
+        # Debt results for the last dependency map, keyed by the per-file
+        # counts they are computed from rather than by the map object
+        self._debt_cache: Optional[Tuple[Tuple[Tuple[str, int, int], ...], DebtStats]] = None
+    
+    @property
+    def dependency_analyzer(self) -> DependencyAnalyzer:
+        """Dependency analyzer for the directory being analyzed, created on first use."""
+        if self._dependency_analyzer is None or self._dependency_analyzer.directory != self._directory:
+            self._dependency_analyzer = DependencyAnalyzer(
+                directory=self._directory,
+                error_handler=self.error_handler,
+                progress_reporter=ProgressReporter(),
+                file_cache=self._file_cache(
+                    "dependencies", FileDependencies.to_dict, FileDependencies.from_dict
+                )
+            )
+        return self._dependency_analyzer
     
-    def analyze_repository(self, directory: str = ".") -> MCPRepositoryAnalysis:
-        """Perform comprehensive repository analysis using MCP."""
+    def _file_cache(self, name: str, encode=None, decode=None) -> Optional[FileResultCache]:
+        """Per-file result cache for one kind of analysis, or None when caching is off."""
+        if self._file_cache_dir is None:
+            return None
+        return FileResultCache(str(self._file_cache_dir / f"{name}.json"), self.error_handler,
+                               encode=encode, decode=decode)
+    
+    def analyze_repository(self, directory: str = ".", force: bool = False) -> MCPRepositoryAnalysis:
+        """
+        Perform comprehensive repository analysis using MCP.
+        
+        If the working tree is unchanged since an analysis cached within the
+        cache TTL, that analysis is returned as is unless `force` is set.
+        """
         print("🔍 Starting MCP repository analysis...")
+        self._directory = directory
         
         # Check if this is a Git repository
         if not self.mcp_client.is_git_repository(directory):
             print("⚠️  Not a Git repository. Running local analysis only.")
             return self._analyze_local_only(directory)
         
+        fingerprint = self._analysis_cache_key(directory) if self._analysis_cache_dir else None
+        if fingerprint:
+            cache_key, root = fingerprint
+            repo_dir = hashlib.sha1(os.path.abspath(root).encode()).hexdigest()
+            cache_file = self._analysis_cache_dir / repo_dir / f"{cache_key}.pkl"
+        
+        if fingerprint and not force:
+            cached = self._load_cached_analysis(cache_file)
+            if cached is not None:
+                print("♻️  Working tree unchanged, using cached analysis")
+                return cached
+        
+        analysis = self._analyze_git_repository()
+        
+        if fingerprint:
+            self._save_cached_analysis(cache_file, analysis)
+        
+        return analysis
+    
+    def _analyze_git_repository(self) -> MCPRepositoryAnalysis:
+        """Analyze the current directory's repository with its GitHub data."""
         # Get comprehensive GitHub data via MCP
         print("📊 Fetching GitHub repository data...")
-        analytics = self.mcp_client.get_repository_analytics()
+        # The fetch is network-bound and independent of the local analysis,
+        # so it runs in the background while this thread scans the codebase
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            analytics_future = executor.submit(self._fetch_analytics)
+            
+            # Perform dependency analysis
+            print("🔗 Analyzing code dependencies...")
+            dependencies, all_files = self.dependency_analyzer.analyze_codebase()
+            
+            # Perform advanced quality analysis
+            print("📊 Analyzing code quality metrics...")
+            quality_report = self.advanced_analyzer.generate_quality_report(all_files)
+            
+            # Generate refactoring suggestions
+            print("🤖 Generating AI-powered refactoring suggestions...")
+            refactoring_suggestions = self._generate_refactoring_suggestions(all_files, quality_report)
+            
+            analytics = analytics_future.result()
         
         repository = analytics.get("repository")
         if repository:
-            print(f"📦 Repository: {repository.full_name}")
-            print(f"🌍 Language: {repository.language or 'Unknown'}")
-            print(f"⭐ Stars: {repository.stars}")
-            print(f"🍴 Forks: {repository.forks}")
-            print(f"📝 Issues: {repository.issues}")
-            print(f"🔀 Pull Requests: {repository.pull_requests}")
-        
-        # Perform dependency analysis
-        print("🔗 Analyzing code dependencies...")
-        dependencies, all_files = self.dependency_analyzer.analyze_codebase()
-        
-        # Perform advanced quality analysis
-        print("📊 Analyzing code quality metrics...")
-        quality_report = self.advanced_analyzer.generate_quality_report(all_files)
-        
-        # Generate refactoring suggestions
-        print("🤖 Generating AI-powered refactoring suggestions...")
-        refactoring_suggestions = self._generate_refactoring_suggestions(all_files, quality_report)
+            # One write for the whole block rather than one per line
+            print("\n".join((
+                f"📦 Repository: {repository.full_name}",
+                f"🌍 Language: {repository.language or 'Unknown'}",
+                f"⭐ Stars: {repository.stars}",
+                f"🍴 Forks: {repository.forks}",
+                f"📝 Issues: {repository.issues}",
+                f"🔀 Pull Requests: {repository.pull_requests}"
+            )))
         
         # Get file breakdown
         file_breakdown = self._get_file_breakdown(all_files)
@@ -101,10 +300,10 @@ class MCPRepositoryAnalyzer:
         commit_history = analytics.get("commit_history", [])
         
         # Calculate debt score
-        debt_score = self._calculate_debt_score(dependencies, file_breakdown)
+        stats = self._compute_stats(dependencies)
         
         # Generate recommendations
-        recommendations = self._generate_recommendations(dependencies, debt_score, quality_report)
+        recommendations = self._generate_recommendations(stats, quality_report)
         
         # Analyze PR debt
         pr_debt_analysis = self._analyze_pr_debt(pull_requests, dependencies)
@@ -121,20 +320,124 @@ class MCPRepositoryAnalyzer:
             issues=issues,
             pull_requests=pull_requests,
             commit_history=commit_history,
-            debt_score=debt_score,
+            debt_score=stats.score,
             recommendations=recommendations,
             pr_debt_analysis=pr_debt_analysis,
+            pr_debt_buckets=self._bucket_pr_debt(pr_debt_analysis),
             team_insights=team_insights,
             refactoring_suggestions=refactoring_suggestions,
-            quality_report=quality_report
+            quality_report=quality_report,
+            total_imports=stats.total_imports,
+            total_exports=stats.total_exports
         )
     
+    def _fetch_analytics(self) -> Dict[str, Any]:
+        """Fetch the repository's GitHub data, in one GraphQL round-trip when possible."""
+        # The GraphQL path returns {} on any error, rate limits included
+        analytics = self.mcp_client.get_repository_analytics_graphql() if self._use_graphql else {}
+        return analytics or self.mcp_client.get_repository_analytics()
+    
+    def _analysis_cache_key(self, directory: str) -> Optional[Tuple[str, str]]:
+        """
+        Fingerprint the working tree: HEAD, plus the status and stat of every changed file.
+        
+        Ignored paths are included, since the analyzer may scan files git
+        ignores. Returns (key, repository root), or None if git can't tell, in
+        which case nothing is cached.
+        """
+        try:
+            top_level = subprocess.run(
+                ["git", "-C", directory, "rev-parse", "HEAD", "--show-toplevel"],
+                capture_output=True, text=True, timeout=5
+            )
+            status = subprocess.run(
+                ["git", "-C", directory, "status", "--porcelain", "-z", "--untracked-files=all",
+                 "--ignored=matching", "--", ".", *_ANALYSIS_OUTPUT_EXCLUDES],
+                capture_output=True, text=True, timeout=30
+            )
+        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return None
+        
+        if top_level.returncode != 0 or status.returncode != 0:
+            return None
+        
+        head, root = top_level.stdout.split("\n")[:2]
+        digest = hashlib.sha1(f"{os.path.abspath(directory)}\0{head}\0{status.stdout}".encode())
+        
+        # Editing an already modified or ignored file doesn't change the status
+        # line; for ignored directories the stat catches added or removed files
+        for entry in filter(None, status.stdout.split("\0")):
+            try:
+                stat = os.stat(os.path.join(root, entry[3:]))
+                digest.update(f"\0{stat.st_mtime_ns}:{stat.st_size}".encode())
+            except (OSError, ValueError):
+                digest.update(b"\0-")
+        
+        return digest.hexdigest(), root
+    
+    @staticmethod
+    def _analyzed_file_stats(analysis: MCPRepositoryAnalysis) -> Dict[str, Optional[Tuple[int, int]]]:
+        """(mtime_ns, size) of every file whose contents the analysis depends on."""
+        file_paths = set(analysis.dependencies)
+        file_paths.update(analysis.quality_report.get('complexity_metrics', {}))
+        
+        file_stats = {}
+        for file_path in file_paths:
+            try:
+                stat = os.stat(file_path)
+                file_stats[file_path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                file_stats[file_path] = None
+        return file_stats
+    
+    def _load_cached_analysis(self, cache_file: Path) -> Optional[MCPRepositoryAnalysis]:
+        """Load a cached analysis if it is within the TTL and none of its files changed."""
+        try:
+            if time.time() - cache_file.stat().st_mtime >= self._cache_ttl:
+                return None
+            with open(cache_file, 'rb') as f:
+                file_stats, analysis = pickle.load(f)
+        except Exception:
+            # Missing, unreadable or from an incompatible version: analyze afresh
+            return None
+        
+        if not isinstance(analysis, MCPRepositoryAnalysis):
+            return None
+        
+        # Catches edits to scanned files that git status can't see
+        if self._analyzed_file_stats(analysis) != file_stats:
+            return None
+        
+        return analysis
+    
+    def _save_cached_analysis(self, cache_file: Path, analysis: MCPRepositoryAnalysis):
+        """Cache an analysis with its files' stats, replacing analyses of earlier tree states."""
+        cache_dir = cache_file.parent
+        temp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(temp_file, 'wb') as f:
+                pickle.dump((self._analyzed_file_stats(analysis), analysis), f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_file, cache_file)
+            
+            for stale in cache_dir.glob("*.pkl"):
+                if stale != cache_file:
+                    stale.unlink()
+        except Exception as e:
+            print(f"⚠️  Could not cache analysis: {e}")
+            try:
+                temp_file.unlink()
+            except OSError:
+                pass
+    
     def _analyze_local_only(self, directory: str) -> MCPRepositoryAnalysis:
         """Analyze repository without GitHub integration."""
         dependencies, all_files = self.dependency_analyzer.analyze_codebase()
+        quality_report = self.advanced_analyzer.generate_quality_report(all_files)
         file_breakdown = self._get_file_breakdown(all_files)
-        debt_score = self._calculate_debt_score(dependencies, file_breakdown)
-        recommendations = self._generate_recommendations(dependencies, debt_score)
+        stats = self._compute_stats(dependencies)
+        recommendations = self._generate_recommendations(stats, quality_report)
         
         # Generate refactoring suggestions for local analysis
         refactoring_suggestions = self._generate_refactoring_suggestions(all_files, quality_report)
@@ -148,43 +451,106 @@ class MCPRepositoryAnalyzer:
             issues=[],
             pull_requests=[],
             commit_history=[],
-            debt_score=debt_score,
+            debt_score=stats.score,
             recommendations=recommendations,
             pr_debt_analysis=[],
             team_insights={},
             refactoring_suggestions=refactoring_suggestions,
-            quality_report=quality_report
+            quality_report=quality_report,
+            total_imports=stats.total_imports,
+            total_exports=stats.total_exports
         )
     
-    def _get_file_breakdown(self, files: List[str]) -> Dict[str, int]:
+    def _get_file_breakdown(self, files: Iterable[str]) -> Dict[str, int]:
         """Get breakdown of files by extension."""
-        breakdown = {}
-        for file_path in files:
-            ext = Path(file_path).suffix.lower()
-            breakdown[ext] = breakdown.get(ext, 0) + 1
-        return breakdown
+        return dict(Counter(map(_file_extension, files)))
     
-    def _calculate_debt_score(self, dependencies: Dict[str, Any], file_breakdown: Dict[str, int]) -> float:
-        """Calculate code debt score based on dependencies and file structure."""
-        if not dependencies:
-            return 0.0
+    def _compute_stats(self, dependencies: Dict[str, Any]) -> DebtStats:
+        """
+        Tally the dependency map once for the debt score and recommendations.
         
-        total_files = len(dependencies)
-        total_imports = sum(len(deps.imports) for deps in dependencies.values())
-        total_exports = sum(len(deps.exports) for deps in dependencies.values())
+        The result for the most recent map is kept, so a repeat call with the
+        same per-file counts skips the tally and scoring.
+        """
+        if not dependencies:
+            return DebtStats()
         
-        # Calculate complexity metrics
-        high_complexity_files = sum(
-            1 for deps in dependencies.values()
-            if len(deps.imports) > 10 or len(deps.exports) > 10
+        # The stats depend only on each file's path and import/export counts
+        fingerprint = tuple(
+            (file_path, len(deps.imports), len(deps.exports))
+            for file_path, deps in dependencies.items()
         )
+        cached = self._debt_cache
+        if cached is not None and cached[0] == fingerprint:
+            return cached[1]
+        
+        if len(dependencies) > _VECTORIZE_DEPENDENCY_THRESHOLD:
+            stats, high_complexity_files = self._tally_dependencies_vectorized(dependencies)
+        else:
+            stats, high_complexity_files = self._tally_dependencies(dependencies)
         
-        no_dependency_files = sum(
-            1 for deps in dependencies.values()
-            if len(deps.imports) == 0 and len(deps.exports) == 0
+        stats.score = self._calculate_debt_score(
+            len(dependencies), high_complexity_files, len(stats.no_dep_files), stats.total_imports
         )
         
-        # Debt score calculation
+        self._debt_cache = (fingerprint, stats)
+        return stats
+    
+    @staticmethod
+    def _tally_dependencies(dependencies: Dict[str, Any]) -> Tuple[DebtStats, int]:
+        """Count imports, exports and outlier files, returning them with the high-complexity file count."""
+        high_dep_files = []
+        no_dep_files = []
+        total_imports = total_exports = high_complexity_files = 0
+        
+        # One pass for every tally and file list, accumulating in locals
+        for file_path, deps in dependencies.items():
+            import_count = len(deps.imports)
+            export_count = len(deps.exports)
+            total_imports += import_count
+            total_exports += export_count
+            if import_count > 10:
+                high_dep_files.append(file_path)
+            if import_count > 10 or export_count > 10:
+                high_complexity_files += 1
+            elif import_count == 0 and export_count == 0:
+                no_dep_files.append(file_path)
+        
+        stats = DebtStats(
+            total_imports=total_imports,
+            total_exports=total_exports,
+            high_dep_files=high_dep_files,
+            no_dep_files=no_dep_files
+        )
+        return stats, high_complexity_files
+    
+    @staticmethod
+    def _tally_dependencies_vectorized(dependencies: Dict[str, Any]) -> Tuple[DebtStats, int]:
+        """Same as _tally_dependencies, with the counting done on arrays of per-file sizes."""
+        # Imported here since only large repositories take this path
+        import numpy as np
+        
+        count = len(dependencies)
+        import_counts = np.fromiter((len(deps.imports) for deps in dependencies.values()), dtype=np.int64, count=count)
+        export_counts = np.fromiter((len(deps.exports) for deps in dependencies.values()), dtype=np.int64, count=count)
+        file_paths = list(dependencies)
+        
+        high_imports = import_counts > 10
+        high_complexity = high_imports | (export_counts > 10)
+        no_dependencies = (import_counts == 0) & (export_counts == 0)
+        
+        stats = DebtStats(
+            total_imports=int(import_counts.sum()),
+            total_exports=int(export_counts.sum()),
+            high_dep_files=[file_paths[i] for i in np.flatnonzero(high_imports).tolist()],
+            no_dep_files=[file_paths[i] for i in np.flatnonzero(no_dependencies).tolist()]
+        )
+        return stats, int(np.count_nonzero(high_complexity))
+    
+    @staticmethod
+    def _calculate_debt_score(total_files: int, high_complexity_files: int,
+                              no_dependency_files: int, total_imports: int) -> float:
+        """Calculate code debt score from the dependency tallies."""
         complexity_score = min(high_complexity_files / max(total_files, 1), 1.0)
         dead_code_score = min(no_dependency_files / max(total_files, 1), 1.0)
         import_density = min(total_imports / max(total_files * 5, 1), 1.0)
@@ -194,34 +560,24 @@ class MCPRepositoryAnalyzer:
         
         return min(debt_score, 1.0)
     
-    def _generate_recommendations(self, dependencies: Dict[str, Any], debt_score: float, quality_report: Dict[str, Any]) -> List[str]:
+    def _generate_recommendations(self, stats: DebtStats, quality_report: Dict[str, Any]) -> List[str]:
         """Generate recommendations based on analysis."""
         recommendations = []
         
-        if debt_score > 0.7:
+        if stats.score > 0.7:
             recommendations.append("🔴 High debt detected! Consider refactoring complex dependencies.")
-        elif debt_score > 0.5:
+        elif stats.score > 0.5:
             recommendations.append("🟡 Moderate debt detected. Consider reviewing complex files.")
         else:
             recommendations.append("🟢 Low debt detected. Good code organization!")
         
         # Check for files with high dependency counts
-        high_dep_files = [
-            file_path for file_path, deps in dependencies.items()
-            if len(deps.imports) > 10
-        ]
-        
-        if high_dep_files:
-            recommendations.append(f"📦 {len(high_dep_files)} files have high dependency counts. Consider breaking them down.")
+        if stats.high_dep_files:
+            recommendations.append(f"📦 {len(stats.high_dep_files)} files have high dependency counts. Consider breaking them down.")
         
         # Check for files with no dependencies (potential dead code)
-        no_dep_files = [
-            file_path for file_path, deps in dependencies.items()
-            if len(deps.imports) == 0 and len(deps.exports) == 0
-        ]
-        
-        if no_dep_files:
-            recommendations.append(f"🧹 {len(no_dep_files)} files have no dependencies. Check for dead code.")
+        if stats.no_dep_files:
+            recommendations.append(f"🧹 {len(stats.no_dep_files)} files have no dependencies. Check for dead code.")
         
         # Add quality-based recommendations
         if quality_report.get('recommendations'):
@@ -231,6 +587,9 @@ class MCPRepositoryAnalyzer:
     
     def _analyze_pr_debt(self, pull_requests: List[Dict[str, Any]], dependencies: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Analyze debt in pull requests."""
+        if len(pull_requests) > _VECTORIZE_PR_THRESHOLD:
+            return self._analyze_pr_debt_vectorized(pull_requests)
+        
         pr_analysis = []
         
         for pr in pull_requests:
@@ -245,6 +604,7 @@ class MCPRepositoryAnalyzer:
                     "number": pr.get("number"),
                     "title": pr.get("title"),
                     "debt_score": debt_ratio,
+                    "severity": self._pr_debt_severity(debt_ratio),
                     "additions": additions,
                     "deletions": deletions,
                     "total_changes": total_changes
@@ -252,14 +612,71 @@ class MCPRepositoryAnalyzer:
         
         return pr_analysis
     
+    @classmethod
+    def _analyze_pr_debt_vectorized(cls, pull_requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Same as _analyze_pr_debt, dividing all PRs' change counts in one array operation."""
+        # Imported here since only repositories with many PRs take this path
+        import numpy as np
+        
+        count = len(pull_requests)
+        additions = np.fromiter((pr.get("additions", 0) for pr in pull_requests), dtype=np.int64, count=count)
+        deletions = np.fromiter((pr.get("deletions", 0) for pr in pull_requests), dtype=np.int64, count=count)
+        totals = additions + deletions
+        
+        # PRs without changes get no entry, as in the scalar loop
+        changed = np.flatnonzero(totals > 0)
+        changed_totals = totals[changed]
+        debt_ratios = additions[changed] / changed_totals  # More additions = more debt
+        
+        pr_analysis = []
+        for index, debt_ratio, total_changes in zip(changed.tolist(), debt_ratios.tolist(), changed_totals.tolist()):
+            pr = pull_requests[index]
+            pr_analysis.append({
+                "number": pr.get("number"),
+                "title": pr.get("title"),
+                "debt_score": debt_ratio,
+                "severity": cls._pr_debt_severity(debt_ratio),
+                "additions": pr.get("additions", 0),
+                "deletions": pr.get("deletions", 0),
+                "total_changes": total_changes
+            })
+        
+        return pr_analysis
+    
+    @staticmethod
+    def _pr_debt_severity(debt_ratio: float) -> str:
+        """Classify a PR debt ratio as high, moderate or low."""
+        if debt_ratio > _HIGH_PR_DEBT:
+            return "high"
+        if debt_ratio > _MODERATE_PR_DEBT:
+            return "moderate"
+        return "low"
+    
+    @staticmethod
+    def _bucket_pr_debt(pr_analysis: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """Group analyzed PRs by severity, keeping their order within each group."""
+        buckets = {"high": [], "moderate": [], "low": []}
+        for pr in pr_analysis:
+            buckets[pr["severity"]].append(pr)
+        return buckets
+    
+    def _get_pr_debt_buckets(self, analysis: MCPRepositoryAnalysis) -> Dict[str, List[Dict[str, Any]]]:
+        """Get the analysis' PRs by severity, grouping them on first use if needed."""
+        if not analysis.pr_debt_buckets:
+            analysis.pr_debt_buckets = self._bucket_pr_debt(analysis.pr_debt_analysis)
+        return analysis.pr_debt_buckets
+    
     def _generate_team_insights(self, contributors: List[Dict[str, Any]], commit_history: List[Dict[str, Any]], issues: List[GitHubIssue]) -> Dict[str, Any]:
         """Generate team collaboration insights."""
+        # One pass over the issues for every state count
+        issue_states = Counter(issue.state for issue in issues)
+        
         insights = {
             "total_contributors": len(contributors),
-            "active_contributors": len([c for c in contributors if c.get("contributions", 0) > 0]),
+            "active_contributors": sum(1 for c in contributors if c.get("contributions", 0) > 0),
             "recent_commits": len(commit_history),
-            "open_issues": len([i for i in issues if i.state == "open"]),
-            "closed_issues": len([i for i in issues if i.state == "closed"])
+            "open_issues": issue_states["open"],
+            "closed_issues": issue_states["closed"]
         }
         
         return insights
@@ -269,18 +686,21 @@ class MCPRepositoryAnalyzer:
         suggestions = []
         
         # Get files with high complexity
-        high_complexity_files = []
-        for file_path, metrics in quality_report.get('complexity_metrics', {}).items():
-            if hasattr(metrics, 'cyclomatic_complexity') and metrics.cyclomatic_complexity > 10:
-                high_complexity_files.append(file_path)
+        complexity_metrics = quality_report.get('complexity_metrics', {})
+        high_complexity_files = [
+            (file_path, metrics) for file_path, metrics in complexity_metrics.items()
+            if isinstance(metrics, ComplexityMetrics) and metrics.cyclomatic_complexity > 10
+        ]
         
-        # Generate suggestions for high complexity files
-        for file_path in high_complexity_files[:5]:  # Limit to top 5 files
+        # Generate suggestions for the 5 most complex files
+        jobs = heapq.nlargest(5, high_complexity_files, key=lambda job: job[1].cyclomatic_complexity)
+        
+        # Run in this process: for at most five files a worker pool costs more
+        # than the AST work, and forking while the GitHub fetch thread is busy
+        # could deadlock the children
+        for file_path, metrics in jobs:
             try:
-                file_suggestions = self.code_generator.analyze_file_for_refactoring(
-                    file_path, 
-                    quality_report.get('complexity_metrics', {}).get(file_path, {})
-                )
+                file_suggestions = self.code_generator.analyze_file_for_refactoring(file_path, metrics)
                 
                 for suggestion in file_suggestions:
                     suggestions.append({
@@ -301,76 +721,79 @@ class MCPRepositoryAnalyzer:
     
     def print_analysis_summary(self, analysis: MCPRepositoryAnalysis):
         """Print comprehensive analysis summary."""
-        print("\n" + "="*60)
-        print("📊 MCP REPOSITORY ANALYSIS SUMMARY")
-        print("="*60)
+        # Build the report in memory and write it to the terminal in one go
+        out = io.StringIO()
+        
+        print("\n" + "="*60, file=out)
+        print("📊 MCP REPOSITORY ANALYSIS SUMMARY", file=out)
+        print("="*60, file=out)
         
         if analysis.repository:
-            print(f"📦 Repository: {analysis.repository.full_name}")
-            print(f"🌍 Primary Language: {analysis.repository.language or 'Unknown'}")
-            print(f"⭐ Stars: {analysis.repository.stars}")
-            print(f"🍴 Forks: {analysis.repository.forks}")
-            print(f"📝 Issues: {analysis.repository.issues}")
-            print(f"🔀 Pull Requests: {analysis.repository.pull_requests}")
+            print(f"📦 Repository: {analysis.repository.full_name}", file=out)
+            print(f"🌍 Primary Language: {analysis.repository.language or 'Unknown'}", file=out)
+            print(f"⭐ Stars: {analysis.repository.stars}", file=out)
+            print(f"🍴 Forks: {analysis.repository.forks}", file=out)
+            print(f"📝 Issues: {analysis.repository.issues}", file=out)
+            print(f"🔀 Pull Requests: {analysis.repository.pull_requests}", file=out)
         
-        print(f"\n📁 File Breakdown:")
-        for ext, count in sorted(analysis.file_breakdown.items(), key=lambda x: x[1], reverse=True)[:10]:
-            print(f"   {ext}: {count} files")
+        print(f"\n📁 File Breakdown:", file=out)
+        for ext, count in heapq.nlargest(10, analysis.file_breakdown.items(), key=itemgetter(1)):
+            print(f"   {ext}: {count} files", file=out)
         
         if analysis.language_stats and isinstance(analysis.language_stats, dict):
-            print(f"\n🌍 Language Statistics:")
-            for lang, bytes_count in sorted(analysis.language_stats.items(), key=lambda x: x[1], reverse=True)[:5]:
-                print(f"   {lang}: {bytes_count:,} bytes")
-        
-        print(f"\n🔗 Dependency Analysis:")
-        total_files = len(analysis.dependencies)
-        total_imports = sum(len(deps.imports) for deps in analysis.dependencies.values())
-        total_exports = sum(len(deps.exports) for deps in analysis.dependencies.values())
+            print(f"\n🌍 Language Statistics:", file=out)
+            for lang, bytes_count in heapq.nlargest(5, analysis.language_stats.items(), key=itemgetter(1)):
+                print(f"   {lang}: {bytes_count:,} bytes", file=out)
         
-        print(f"   Files analyzed: {total_files}")
-        print(f"   Total imports: {total_imports}")
-        print(f"   Total exports: {total_exports}")
+        print(f"\n🔗 Dependency Analysis:", file=out)
+        print(f"   Files analyzed: {len(analysis.dependencies)}", file=out)
+        print(f"   Total imports: {analysis.total_imports}", file=out)
+        print(f"   Total exports: {analysis.total_exports}", file=out)
         
-        print(f"\n💰 Debt Score: {analysis.debt_score:.1%}")
+        print(f"\n💰 Debt Score: {analysis.debt_score:.1%}", file=out)
         
         # Add advanced quality metrics
         if hasattr(analysis, 'quality_report'):
             quality = analysis.quality_report.get('quality_scores', {})
             if hasattr(quality, 'overall_score'):
-                print(f"📊 Quality Score: {quality.overall_score:.1%}")
-                print(f"   Complexity: {quality.complexity_score:.1%}")
-                print(f"   Duplication: {quality.duplication_score:.1%}")
-                print(f"   Documentation: {quality.documentation_score:.1%}")
+                print(f"📊 Quality Score: {quality.overall_score:.1%}", file=out)
+                print(f"   Complexity: {quality.complexity_score:.1%}", file=out)
+                print(f"   Duplication: {quality.duplication_score:.1%}", file=out)
+                print(f"   Documentation: {quality.documentation_score:.1%}", file=out)
         
-        print(f"\n💡 Recommendations:")
+        print(f"\n💡 Recommendations:", file=out)
         for rec in analysis.recommendations:
-            print(f"   {rec}")
+            print(f"   {rec}", file=out)
         
         if analysis.contributors:
-            print(f"\n👥 Team Insights:")
-            print(f"   Total contributors: {analysis.team_insights.get('total_contributors', 0)}")
-            print(f"   Active contributors: {analysis.team_insights.get('active_contributors', 0)}")
-            print(f"   Recent commits: {analysis.team_insights.get('recent_commits', 0)}")
-            print(f"   Open issues: {analysis.team_insights.get('open_issues', 0)}")
-            print(f"   Closed issues: {analysis.team_insights.get('closed_issues', 0)}")
+            print(f"\n👥 Team Insights:", file=out)
+            print(f"   Total contributors: {analysis.team_insights.get('total_contributors', 0)}", file=out)
+            print(f"   Active contributors: {analysis.team_insights.get('active_contributors', 0)}", file=out)
+            print(f"   Recent commits: {analysis.team_insights.get('recent_commits', 0)}", file=out)
+            print(f"   Open issues: {analysis.team_insights.get('open_issues', 0)}", file=out)
+            print(f"   Closed issues: {analysis.team_insights.get('closed_issues', 0)}", file=out)
         
         if analysis.pr_debt_analysis:
-            print(f"\n🔀 Pull Request Debt Analysis:")
-            high_debt_prs = [pr for pr in analysis.pr_debt_analysis if pr["debt_score"] > 0.7]
+            print(f"\n🔀 Pull Request Debt Analysis:", file=out)
+            buckets = self._get_pr_debt_buckets(analysis)
+            high_debt_prs = buckets["high"] + buckets["moderate"]
             if high_debt_prs:
-                print(f"   High debt PRs: {len(high_debt_prs)}")
+                print(f"   High debt PRs: {len(high_debt_prs)}", file=out)
                 for pr in high_debt_prs[:3]:  # Show top 3
-                    print(f"     PR #{pr['number']}: {pr['title']} (Debt: {pr['debt_score']:.1%})")
+                    print(f"     PR #{pr['number']}: {pr['title']} (Debt: {pr['debt_score']:.1%})", file=out)
         
         # Show AI refactoring suggestions
         if hasattr(analysis, 'refactoring_suggestions') and analysis.refactoring_suggestions:
-            print(f"\n🤖 AI Refactoring Suggestions:")
-            print(f"   Found {len(analysis.refactoring_suggestions)} suggestions")
+            print(f"\n🤖 AI Refactoring Suggestions:", file=out)
+            print(f"   Found {len(analysis.refactoring_suggestions)} suggestions", file=out)
             for i, suggestion in enumerate(analysis.refactoring_suggestions[:3], 1):  # Show top 3
-                print(f"   {i}. {suggestion['file_path']}: {suggestion['description']}")
-                print(f"      Confidence: {suggestion['confidence']:.1%}, Complexity Reduction: {suggestion['complexity_reduction']:.1f}")
+                print(f"   {i}. {suggestion['file_path']}: {suggestion['description']}", file=out)
+                print(f"      Confidence: {suggestion['confidence']:.1%}, Complexity Reduction: {suggestion['complexity_reduction']:.1f}", file=out)
+        
+        print("="*60, file=out)
         
-        print("="*60)
+        sys.stdout.write(out.getvalue())
+        sys.stdout.flush()
     
     def create_debt_issues(self, analysis: MCPRepositoryAnalysis, auto_create: bool = False) -> List[int]:
         """Create GitHub issues for debt findings using MCP."""
@@ -378,69 +801,49 @@ class MCPRepositoryAnalyzer:
             print("❌ Not authenticated with GitHub. Cannot create issues.")
             return []
         
-        issues_created = []
+        # (title, body, what it's for), all created in one batched request
+        pending = []
         
         # Create issue for high debt score
         if analysis.debt_score > 0.5:  # Lower threshold for testing
             title = f"High Code Debt Detected ({analysis.debt_score:.1%})"
-            body = f"""
-## Code Debt Analysis
-
-**Debt Score:** {analysis.debt_score:.1%}
-
-### Findings:
-- {len(analysis.dependencies)} files analyzed
-- {sum(len(deps.imports) for deps in analysis.dependencies.values())} total imports
-- {sum(len(deps.exports) for deps in analysis.dependencies.values())} total exports
-
-### Recommendations:
-{chr(10).join(f"- {rec}" for rec in analysis.recommendations)}
-
-### Team Insights:
-- Contributors: {analysis.team_insights.get('total_contributors', 0)}
-- Recent commits: {analysis.team_insights.get('recent_commits', 0)}
-- Open issues: {analysis.team_insights.get('open_issues', 0)}
-
----
-*Generated by Iterate Code Debt Tool with GitHub MCP*
-            """.strip()
-            
-            issue_number = self.mcp_client.create_issue(title=title, body=body)
+            body = _DEBT_ISSUE_TEMPLATE.substitute(
+                debt_score=f"{analysis.debt_score:.1%}",
+                files=len(analysis.dependencies),
+                total_imports=analysis.total_imports,
+                total_exports=analysis.total_exports,
+                recommendations="\n".join(f"- {rec}" for rec in analysis.recommendations),
+                contributors=analysis.team_insights.get('total_contributors', 0),
+                recent_commits=analysis.team_insights.get('recent_commits', 0),
+                open_issues=analysis.team_insights.get('open_issues', 0)
+            )
             
-            if issue_number:
-                issues_created.append(issue_number)
-                print(f"✅ Created issue #{issue_number} for high debt score")
+            pending.append((title, body, "high debt score"))
         
         # Create issues for high debt PRs
-        high_debt_prs = [pr for pr in analysis.pr_debt_analysis if pr["debt_score"] > 0.8]
+        high_debt_prs = self._get_pr_debt_buckets(analysis)["high"]
         for pr in high_debt_prs[:2]:  # Limit to 2 issues
             title = f"High Debt in PR #{pr['number']} ({pr['debt_score']:.1%})"
-            body = f"""
-## Pull Request Debt Analysis
-
-**PR:** #{pr['number']} - {pr['title']}
-**Debt Score:** {pr['debt_score']:.1%}
-
-### Changes:
-- Additions: {pr['additions']}
-- Deletions: {pr['deletions']}
-- Total changes: {pr['total_changes']}
-
-### Recommendation:
-This PR introduces significant new code. Consider:
-- Breaking down large changes into smaller PRs
-- Adding more tests for new functionality
-- Reviewing for potential code duplication
-
----
-*Generated by Iterate Code Debt Tool with GitHub MCP*
-            """.strip()
-            
-            issue_number = self.mcp_client.create_issue(title=title, body=body)
+            body = _PR_DEBT_ISSUE_TEMPLATE.substitute(
+                number=pr['number'],
+                title=pr['title'],
+                debt_score=f"{pr['debt_score']:.1%}",
+                additions=pr['additions'],
+                deletions=pr['deletions'],
+                total_changes=pr['total_changes']
+            )
             
+            pending.append((title, body, f"high debt PR #{pr['number']}"))
+        
+        if not pending:
+            return []
+        
+        issues_created = []
+        numbers = self.mcp_client.create_issues([(title, body) for title, body, _ in pending])
+        for issue_number, (_, _, reason) in zip(numbers, pending):
             if issue_number:
                 issues_created.append(issue_number)
-                print(f"✅ Created issue #{issue_number} for high debt PR #{pr['number']}")
+                print(f"✅ Created issue #{issue_number} for {reason}")
         
         return issues_created
     
@@ -450,32 +853,27 @@ This PR introduces significant new code. Consider:
             print("❌ Not authenticated with GitHub. Cannot comment on PRs.")
             return 0
         
-        commented_count = 0
-        high_debt_prs = [pr for pr in analysis.pr_debt_analysis if pr["debt_score"] > 0.7]
+        buckets = self._get_pr_debt_buckets(analysis)
+        high_debt_prs = buckets["high"] + buckets["moderate"]
+        if not high_debt_prs:
+            return 0
         
+        comments = []
         for pr in high_debt_prs:
-            comment = f"""
-## Code Debt Analysis
-
-This PR has a debt score of **{pr['debt_score']:.1%}**.
-
-### Analysis:
-- Additions: {pr['additions']} lines
-- Deletions: {pr['deletions']} lines
-- Total changes: {pr['total_changes']} lines
-
-### Recommendations:
-- Consider breaking down large changes
-- Add comprehensive tests
-- Review for code duplication
-- Consider pair programming for complex changes
-
----
-*Generated by Iterate Code Debt Tool*
-            """.strip()
+            comment = _PR_DEBT_COMMENT_TEMPLATE.substitute(
+                debt_score=f"{pr['debt_score']:.1%}",
+                additions=pr['additions'],
+                deletions=pr['deletions'],
+                total_changes=pr['total_changes']
+            )
             
-            if self.mcp_client.comment_on_pr(pr["number"], comment):
+            comments.append((pr["number"], comment))
+        
+        # All comments go out in one batched request
+        commented_count = 0
+        for (pr_number, _), added in zip(comments, self.mcp_client.comment_on_prs(comments)):
+            if added:
                 commented_count += 1
-                print(f"✅ Commented on PR #{pr['number']}")
+                print(f"✅ Commented on PR #{pr_number}")
         
         return commented_count 
\ No newline at end of file
@@ -3,11 +3,12 @@ Simple dependency analyzer utility.
 Integrates FileFinder with DependencyMapper for easy analysis.
 """
 
-from typing import Dict, List
+from typing import Dict, List, Optional
 from ..core.file_finder import FileFinder
 from ..core.dependency_mapper import DependencyMapper, FileDependencies
 from ..core.error_handler import ErrorHandler
 from ..core.progress_reporter import ProgressReporter
+from ..core.cache_manager import FileResultCache
 
 
 class DependencyAnalyzer:
@@ -15,7 +16,8 @@ class DependencyAnalyzer:
     High-level dependency analyzer that combines file finding and dependency mapping.
     """
     
-    def __init__(self, directory: str, error_handler: ErrorHandler, progress_reporter: ProgressReporter):
+    def __init__(self, directory: str, error_handler: ErrorHandler, progress_reporter: ProgressReporter,
+                 file_cache: Optional[FileResultCache] = None):
         self.directory = directory
         self.error_handler = error_handler
         self.progress_reporter = progress_reporter
@@ -28,7 +30,8 @@ class DependencyAnalyzer:
         
         self.dependency_mapper = DependencyMapper(
             error_handler=error_handler,
-            progress_reporter=progress_reporter
+            progress_reporter=progress_reporter,
+            file_cache=file_cache
         )
     
     def analyze_codebase(self) -> Dict[str, FileDependencies]: